@@ -1,8 +1,9 @@
 import os
-from dotenv import load_dotenv
+from dotenv import load_dotenv, find_dotenv
 
-# .env 파일 로드
-load_dotenv()
+# .env 파일 로드 (한 번만 읽음)
+# 현재 디렉토리부터 상위로 .env를 찾고, 없으면 프로젝트 루트 상위 경로를 시도
+load_dotenv(find_dotenv() or os.path.join(os.path.dirname(__file__), '../../.env'))
 
 class Settings:
     """
@@ -12,15 +13,12 @@ class Settings:
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")  # development, production
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
     ALLOWED_ORIGINS: list = ["*"]
+    # 재개 가능한 청크 업로드 설정
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "")  # 비어 있으면 시스템 임시 디렉토리 사용
+    UPLOAD_MAX_CHUNK_BYTES: int = int(os.getenv("UPLOAD_MAX_CHUNK_BYTES", str(8 * 1024 * 1024)))
+    UPLOAD_TTL_SECONDS: int = int(os.getenv("UPLOAD_TTL_SECONDS", "3600"))
 
     def __init__(self):
-        # 현재 디렉토리에 .env가 없을 경우, 상위 디렉토리(프로젝트 루트)에서 찾기 시도
-        if not self.XI_API_KEY:
-            load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
-            self.XI_API_KEY = os.getenv("XI_API_KEY")
-            self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-            self.FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
-        
         # ALLOWED_ORIGINS 설정
         origins_str = os.getenv("ALLOWED_ORIGINS")
         if origins_str:
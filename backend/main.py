@@ -1,35 +1,46 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from routers import auth
-from config import settings
-
-# --- FastAPI 앱 초기화 ---
-# title: API 문서(Swagger UI)에 표시될 제목
-# description: API의 목적과 기능에 대한 설명
-# version: API 버전 정보
-app = FastAPI(
-    title="ElevenLabs Realtime Transcription Backend",
-    description="ElevenLabs Realtime API를 활용한 실시간 음성 인식 및 화자 분리 백엔드 서버입니다.",
-    version="1.0.0"
-)
-
-# --- CORS (Cross-Origin Resource Sharing) 설정 ---
-# 프론트엔드(React)가 다른 도메인/포트에서 실행되더라도 백엔드 API를 호출할 수 있도록 허용합니다.
-# settings.ALLOWED_ORIGINS에 정의된 도메인들만 접근을 허용하여 보안을 강화합니다.
-allowed_origins = settings.ALLOWED_ORIGINS
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,      # 허용할 출처 목록
-    allow_credentials=True,             # 쿠키/인증 헤더 포함 허용 여부
-    allow_methods=["GET", "POST", "PUT", "DELETE"], # 허용할 HTTP 메서드
-    allow_headers=["*"],                # 허용할 HTTP 헤더 (모든 헤더 허용)
-)
-
-# --- 라우터 등록 (API 엔드포인트 연결) ---
-# auth 라우터를 '/api' 접두사와 함께 등록합니다.
-# 예: /api/token, /api/transcribe
-app.include_router(auth.router, prefix="/api")
+from startup_profile import startup_profile
+
+# --- 시작 단계별 시간 측정 ---
+# 각 단계(config, import, app_build)의 소요 시간은 /startup 엔드포인트와
+# `python main.py --startup-report` 로 확인할 수 있습니다.
+with startup_profile.phase("config"):
+    from config import settings
+
+with startup_profile.phase("import"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from routers import auth, upload
+
+with startup_profile.phase("app_build"):
+    # --- FastAPI 앱 초기화 ---
+    # title: API 문서(Swagger UI)에 표시될 제목
+    # description: API의 목적과 기능에 대한 설명
+    # version: API 버전 정보
+    app = FastAPI(
+        title="ElevenLabs Realtime Transcription Backend",
+        description="ElevenLabs Realtime API를 활용한 실시간 음성 인식 및 화자 분리 백엔드 서버입니다.",
+        version="1.0.0"
+    )
+
+    # --- CORS (Cross-Origin Resource Sharing) 설정 ---
+    # 프론트엔드(React)가 다른 도메인/포트에서 실행되더라도 백엔드 API를 호출할 수 있도록 허용합니다.
+    # settings.ALLOWED_ORIGINS에 정의된 도메인들만 접근을 허용하여 보안을 강화합니다.
+    allowed_origins = settings.ALLOWED_ORIGINS
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,      # 허용할 출처 목록
+        allow_credentials=True,             # 쿠키/인증 헤더 포함 허용 여부
+        allow_methods=["GET", "POST", "PUT", "DELETE"], # 허용할 HTTP 메서드
+        allow_headers=["*"],                # 허용할 HTTP 헤더 (모든 헤더 허용)
+    )
+
+    # --- 라우터 등록 (API 엔드포인트 연결) ---
+    # auth 라우터를 '/api' 접두사와 함께 등록합니다.
+    # 예: /api/token, /api/transcribe
+    app.include_router(auth.router, prefix="/api")
+    # upload 라우터: 재개 가능한 청크 업로드 (예: /api/uploads)
+    app.include_router(upload.router, prefix="/api")
 
 # --- 루트 엔드포인트 ---
 @app.get("/")
@@ -41,10 +52,31 @@ async def root():
     """
     return {"message": "ElevenLabs Transcription Backend (Python/FastAPI)가 실행 중입니다!"}
 
+# --- 시작 시간 리포트 엔드포인트 ---
+@app.get("/startup", summary="콜드 스타트 시간 리포트")
+async def startup_report():
+    """
+    서버 시작 단계별 소요 시간 리포트
+    
+    콜드 스타트 회귀를 추적하기 위해 단계별 소요 시간(ms)과
+    시작 시점에 불필요하게 로드된 무거운 모듈이 있는지 반환합니다.
+    """
+    return startup_profile.report()
+
 if __name__ == "__main__":
-    import uvicorn
-    # 서버 실행
-    # host="0.0.0.0": 모든 네트워크 인터페이스에서 접근 허용 (외부 접속 가능)
-    # port=8000: 8000번 포트 사용
-    # reload=True: 코드 변경 시 서버 자동 재시작 (개발 모드용)
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ElevenLabs Transcription Backend")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="서버를 실행하지 않고 시작 단계별 소요 시간만 출력")
+    args = parser.parse_args()
+
+    if args.startup_report:
+        print(startup_profile.format_report())
+    else:
+        import uvicorn
+        # 서버 실행
+        # host="0.0.0.0": 모든 네트워크 인터페이스에서 접근 허용 (외부 접속 가능)
+        # port=8000: 8000번 포트 사용
+        # reload=True: 코드 변경 시 서버 자동 재시작 (개발 모드용)
+        uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,211 @@
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from services.uploads import (
+    get_upload_manager,
+    UploadNotFoundError,
+    UploadOffsetError,
+    UploadIntegrityError,
+    UploadBusyError,
+)
+from services.elevenlabs import transcribe_with_speakers, group_by_speaker, ElevenLabsAPIError
+from routers.auth import TranscriptionResponse
+from config import settings
+from typing import Optional
+from pydantic import BaseModel
+import logging
+
+router = APIRouter()
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# --- Pydantic Models (데이터 모델 정의) ---
+
+class UploadStatusResponse(BaseModel):
+    """업로드 상태 응답 모델"""
+    upload_id: str             # 업로드 세션 ID
+    filename: str              # 원본 파일명
+    offset: int                # 서버가 수신한 바이트 수 (다음 청크의 시작 오프셋)
+    total_size: Optional[int]  # 전체 파일 크기 (알 수 없으면 None)
+    sha256: str                # 지금까지 수신한 데이터의 SHA-256
+    finalized: bool            # 업로드 완료 여부
+    processing: bool           # finalize 후 화자 분리 진행 중 여부
+
+
+def _get_manager():
+    return get_upload_manager(
+        upload_dir=settings.UPLOAD_DIR,
+        max_chunk_bytes=settings.UPLOAD_MAX_CHUNK_BYTES,
+        ttl_seconds=settings.UPLOAD_TTL_SECONDS
+    )
+
+
+def _raise_http(e: Exception):
+    """업로드 예외를 HTTP 오류로 변환"""
+    if isinstance(e, UploadNotFoundError):
+        raise HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, UploadOffsetError):
+        # 클라이언트는 offset부터 다시 전송하면 됨
+        raise HTTPException(status_code=409, detail={"message": str(e), "offset": e.expected_offset})
+    if isinstance(e, UploadIntegrityError):
+        raise HTTPException(status_code=422, detail=str(e))
+    if isinstance(e, UploadBusyError):
+        # 이전 finalize 요청이 아직 처리 중 - 잠시 후 다시 호출하면 결과를 받을 수 있음
+        raise HTTPException(status_code=409, detail={"message": str(e), "processing": True})
+    raise e
+
+
+def _is_retryable(e: Exception) -> bool:
+    """
+    업스트림의 일시적인 오류(5xx, 429, 타임아웃, 연결 실패)인지 확인
+    """
+    if isinstance(e, ElevenLabsAPIError):
+        return e.status_code >= 500 or e.status_code == 429
+
+    import httpx  # transcribe_with_speakers에서 이미 import됨
+    return isinstance(e, httpx.TransportError)
+
+# --- Endpoints (API 엔드포인트) ---
+
+@router.post("/uploads", response_model=UploadStatusResponse, summary="재개 가능한 업로드 생성")
+async def create_upload(
+    filename: str = Form("audio.webm", description="원본 파일명 (확장자 포함)"),
+    total_size: Optional[int] = Form(None, description="전체 파일 크기 (bytes). 알 수 없으면 생략")
+):
+    """
+    **청크 업로드 세션을 생성합니다.**
+
+    큰 녹음 파일을 한 번의 요청으로 보내는 대신 청크 단위로 나누어 전송합니다.
+    네트워크가 끊겨도 처음부터 다시 보낼 필요 없이 마지막으로 저장된 위치부터 이어서 전송할 수 있습니다.
+
+    1. `POST /uploads` 로 세션 생성
+    2. `POST /uploads/{upload_id}/chunks` 로 청크를 순서대로 전송
+    3. `POST /uploads/{upload_id}/finalize` 로 완료 및 화자 분리 수행
+
+    - **Returns**:
+        - `upload_id`: 업로드 세션 ID
+        - `offset`: 다음 청크의 시작 오프셋
+    """
+    try:
+        return _get_manager().create(filename, total_size).to_dict()
+    except Exception as e:
+        _raise_http(e)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadStatusResponse, summary="업로드 상태 조회")
+async def get_upload_status(upload_id: str):
+    """
+    **업로드 진행 상태를 조회합니다.**
+
+    연결이 끊긴 후 재개할 때 `offset`을 확인하여 그 위치부터 청크를 다시 전송합니다.
+    """
+    try:
+        return _get_manager().get(upload_id).to_dict()
+    except Exception as e:
+        _raise_http(e)
+
+
+@router.post("/uploads/{upload_id}/chunks", response_model=UploadStatusResponse, summary="청크 추가")
+async def append_chunk(
+    upload_id: str,
+    chunk: UploadFile = File(..., description="청크 데이터"),
+    offset: int = Form(..., description="청크의 시작 바이트 오프셋"),
+    checksum: Optional[str] = Form(None, description="청크의 SHA-256 (hex). 지정 시 검증")
+):
+    """
+    **청크를 지정한 오프셋에 추가합니다.**
+
+    - 오프셋이 서버 오프셋보다 크면 `409`와 함께 서버 오프셋을 반환합니다.
+    - 이미 받은 구간과 겹치는 재전송은 겹치는 부분만 건너뛰고 받아들입니다.
+    """
+    try:
+        data = await chunk.read()
+        session = await _get_manager().append(upload_id, offset, data, checksum)
+        return session.to_dict()
+    except Exception as e:
+        _raise_http(e)
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=TranscriptionResponse, summary="업로드 완료 및 화자 분리")
+async def finalize_upload(
+    upload_id: str,
+    total_size: Optional[int] = Form(None, description="전체 파일 크기 (bytes). 지정 시 검증"),
+    sha256: Optional[str] = Form(None, description="전체 파일의 SHA-256 (hex). 지정 시 검증"),
+    language: Optional[str] = Form(None, description="오디오 언어 코드 (예: ko, en). 생략 시 자동 감지.")
+):
+    """
+    **업로드를 완료하고 화자 분리된 텍스트를 반환합니다.**
+
+    크기와 체크섬을 검증한 뒤 ElevenLabs API로 화자 분리를 요청합니다.
+    응답 형식은 `POST /transcribe`와 같습니다.
+
+    - 이전 finalize 요청이 처리 중이면 `409`를 반환합니다 (`detail.processing = true`).
+    - 이미 처리된 업로드를 다시 finalize하면 저장된 결과를 그대로 반환합니다.
+    - ElevenLabs의 일시적인 오류(`503`/`504`)에는 업로드가 유지되므로 finalize만 다시 호출하면 됩니다.
+    """
+    manager = _get_manager()
+    try:
+        session = await manager.finalize(upload_id, total_size, sha256)
+    except Exception as e:
+        _raise_http(e)
+
+    if session.result is not None:
+        # 이미 처리된 업로드에 대한 재시도 - ElevenLabs를 다시 호출하지 않고 저장된 결과 반환
+        return session.result
+
+    result = None
+    retryable = False
+    try:
+        with open(session.path, "rb") as spool:
+            audio_content = spool.read()
+        logger.info(f"업로드 완료 파일 크기: {len(audio_content)} bytes")
+
+        transcription_data = await transcribe_with_speakers(
+            audio_content,
+            session.filename,
+            language
+        )
+        speakers = group_by_speaker(transcription_data)
+
+        result = {
+            "success": True,
+            "fullTranscript": transcription_data.get('text', ''),
+            "speakers": speakers,
+            "words": transcription_data.get('words', [])
+        }
+        return result
+
+    except ValueError as e:
+        logger.error(f"❌ ValueError: {e}")
+        raise HTTPException(status_code=500, detail="API 인증에 실패했습니다. 서버 설정을 확인해주세요.")
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"❌ Exception: {error_msg}")
+        retryable = _is_retryable(e)
+        if "timeout" in error_msg.lower() or "timeout" in type(e).__name__.lower():
+            raise HTTPException(status_code=504, detail="처리 시간이 초과되었습니다. 오디오 파일이 너무 큽니다.")
+        elif "connection" in error_msg.lower() or retryable:
+            raise HTTPException(status_code=503, detail="외부 서비스에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.")
+        else:
+            raise HTTPException(status_code=500, detail="화자 분리 처리 중 오류가 발생했습니다.")
+
+    finally:
+        if result is not None:
+            manager.complete(upload_id, result)
+        elif retryable:
+            # 업로드한 데이터는 유지 - 같은 upload_id로 finalize만 다시 호출하면 됨
+            manager.release(upload_id)
+        else:
+            manager.discard(upload_id, missing_ok=True)
+
+
+@router.delete("/uploads/{upload_id}", summary="업로드 취소")
+async def cancel_upload(upload_id: str):
+    """
+    **업로드 세션과 임시 파일을 삭제합니다.**
+    """
+    try:
+        _get_manager().discard(upload_id)
+    except Exception as e:
+        _raise_http(e)
+    return {"success": True}
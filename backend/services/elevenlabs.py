@@ -1,7 +1,15 @@
-import httpx
 from config import settings
 from typing import List, Dict, Any
 
+
+class ElevenLabsAPIError(Exception):
+    """ElevenLabs API가 200이 아닌 응답을 반환함"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 async def get_realtime_token():
     """
     ElevenLabs API에 요청하여 Realtime Scribe용 일회용 토큰을 받아옵니다.
@@ -15,6 +23,9 @@ async def get_realtime_token():
         "Content-Type": "application/json"
     }
 
+    # httpx는 외부 API를 처음 호출할 때 import (서버 시작 시간 단축)
+    import httpx
+
     async with httpx.AsyncClient() as client:
         response = await client.post(url, headers=headers)
 
@@ -54,11 +65,13 @@ async def transcribe_with_speakers(audio_file: bytes, filename: str, language: s
         "xi-api-key": settings.XI_API_KEY
     }
 
+    import httpx
+
     async with httpx.AsyncClient(timeout=60.0) as client:
         response = await client.post(url, headers=headers, files=files, data=data)
 
         if response.status_code != 200:
-            raise Exception(f"화자 분리 실패: {response.text}")
+            raise ElevenLabsAPIError(f"화자 분리 실패: {response.text}", response.status_code)
 
         return response.json()
 
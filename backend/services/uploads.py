@@ -0,0 +1,276 @@
+"""
+재개 가능한(Resumable) 청크 업로드 서비스
+"""
+from typing import Dict, Optional, Any
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class UploadNotFoundError(Exception):
+    """존재하지 않거나 만료된 업로드 세션"""
+
+
+class UploadOffsetError(Exception):
+    """청크 오프셋이 서버에 저장된 오프셋과 맞지 않음"""
+
+    def __init__(self, expected_offset: int):
+        super().__init__(f"오프셋 불일치: 서버 오프셋은 {expected_offset} 입니다")
+        self.expected_offset = expected_offset
+
+
+class UploadIntegrityError(ValueError):
+    """체크섬 또는 크기 검증 실패"""
+
+
+class UploadBusyError(Exception):
+    """이미 완료 처리(음성 인식)가 진행 중인 업로드"""
+
+
+class UploadSession:
+    """
+    하나의 재개 가능한 업로드 상태
+
+    청크는 디스크의 스풀 파일에 순서대로 이어 붙이며,
+    전체 파일의 SHA-256은 청크가 추가될 때마다 점진적으로 계산합니다.
+    """
+
+    def __init__(self, upload_id: str, filename: str, path: str,
+                 total_size: Optional[int] = None):
+        self.upload_id = upload_id
+        self.filename = filename
+        self.path = path
+        self.total_size = total_size
+        self.offset = 0
+        self.finalized = False
+        self.processing = False  # finalize 후 결과를 만드는 중
+        self.result: Optional[Dict[str, Any]] = None  # 완료된 결과 (finalize 재시도 시 재사용)
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.lock = asyncio.Lock()
+        self._hasher = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        """지금까지 수신한 데이터의 SHA-256 (hex)"""
+        return self._hasher.hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 응답용 딕셔너리"""
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "offset": self.offset,
+            "total_size": self.total_size,
+            "sha256": self.sha256,
+            "finalized": self.finalized,
+            "processing": self.processing,
+        }
+
+
+class UploadManager:
+    """
+    업로드 세션을 생성/추가/완료하고 스풀 파일을 관리하는 클래스
+    """
+
+    def __init__(self, upload_dir: str, max_chunk_bytes: int, ttl_seconds: int):
+        """
+        UploadManager 초기화
+
+        Args:
+            upload_dir: 청크를 스풀할 디렉토리
+            max_chunk_bytes: 청크 하나의 최대 크기
+            ttl_seconds: 마지막 활동 이후 세션을 유지할 시간
+        """
+        self.upload_dir = upload_dir
+        self.max_chunk_bytes = max_chunk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, UploadSession] = {}
+        os.makedirs(upload_dir, exist_ok=True)
+
+        logger.info(f"UploadManager 초기화: dir={upload_dir}, max_chunk={max_chunk_bytes}, ttl={ttl_seconds}s")
+
+    def create(self, filename: str, total_size: Optional[int] = None) -> UploadSession:
+        """
+        새 업로드 세션 생성
+        """
+        self.cleanup_expired()
+
+        if total_size is not None and total_size < 0:
+            raise UploadIntegrityError("total_size는 0 이상이어야 합니다")
+
+        upload_id = uuid.uuid4().hex
+        suffix = os.path.splitext(filename)[1] or ".webm"
+        path = os.path.join(self.upload_dir, f"{upload_id}{suffix}")
+        # 빈 스풀 파일 생성
+        open(path, "wb").close()
+
+        session = UploadSession(upload_id, filename, path, total_size)
+        self._sessions[upload_id] = session
+        logger.info(f"업로드 세션 생성: {upload_id} ({filename}, total_size={total_size})")
+        return session
+
+    def get(self, upload_id: str) -> UploadSession:
+        """
+        업로드 세션 조회
+        """
+        session = self._sessions.get(upload_id)
+        if session is None:
+            raise UploadNotFoundError(f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+        return session
+
+    async def append(self, upload_id: str, offset: int, data: bytes,
+                     checksum: Optional[str] = None) -> UploadSession:
+        """
+        청크를 지정한 오프셋에 추가
+
+        이미 수신한 구간과 겹치는 재전송은 겹치는 부분을 건너뛰고 받아들이므로,
+        응답을 받지 못한 클라이언트가 같은 청크를 다시 보내도 안전합니다.
+
+        Args:
+            upload_id: 업로드 세션 ID
+            offset: 청크의 시작 바이트 오프셋
+            data: 청크 데이터
+            checksum: (Optional) 청크의 SHA-256 (hex)
+        """
+        session = self.get(upload_id)
+
+        if len(data) > self.max_chunk_bytes:
+            raise UploadIntegrityError(f"청크 크기가 최대값({self.max_chunk_bytes} bytes)을 초과합니다")
+        if checksum and hashlib.sha256(data).hexdigest() != checksum.lower():
+            raise UploadIntegrityError("청크 체크섬이 일치하지 않습니다")
+
+        async with session.lock:
+            if session.finalized:
+                raise UploadIntegrityError("이미 완료된 업로드입니다")
+            if offset > session.offset or offset < 0:
+                raise UploadOffsetError(session.offset)
+
+            # 이미 받은 부분은 건너뛰기
+            new_data = data[session.offset - offset:]
+            if session.total_size is not None and session.offset + len(new_data) > session.total_size:
+                raise UploadIntegrityError("업로드 데이터가 total_size를 초과합니다")
+
+            if new_data:
+                with open(session.path, "ab") as spool:
+                    spool.write(new_data)
+                session._hasher.update(new_data)
+                session.offset += len(new_data)
+            session.updated_at = time.time()
+
+        return session
+
+    async def finalize(self, upload_id: str, total_size: Optional[int] = None,
+                       sha256: Optional[str] = None) -> UploadSession:
+        """
+        업로드 완료 및 무결성 검증
+
+        결과가 이미 있으면 검증 없이 세션을 그대로 반환하므로(session.result),
+        응답을 받지 못한 클라이언트가 finalize를 다시 호출해도 인식을 두 번 수행하지 않습니다.
+        처리가 진행 중이면 UploadBusyError를 발생시킵니다.
+        """
+        session = self.get(upload_id)
+
+        async with session.lock:
+            if session.result is not None:
+                return session
+            if session.processing:
+                raise UploadBusyError(f"업로드를 처리하는 중입니다: {upload_id}")
+
+            expected_size = total_size if total_size is not None else session.total_size
+            if expected_size is not None and session.offset != expected_size:
+                raise UploadOffsetError(session.offset)
+            if sha256 and session.sha256 != sha256.lower():
+                raise UploadIntegrityError("파일 체크섬이 일치하지 않습니다")
+            if session.offset == 0:
+                raise UploadIntegrityError("업로드된 데이터가 없습니다")
+
+            session.finalized = True
+            session.processing = True
+            session.updated_at = time.time()
+
+        logger.info(f"업로드 완료: {upload_id} ({session.offset} bytes, sha256={session.sha256[:12]}...)")
+        return session
+
+    def complete(self, upload_id: str, result: Dict[str, Any]) -> None:
+        """
+        처리 결과를 저장하고 스풀 파일 삭제
+
+        세션은 TTL 동안 남겨 두어 finalize 재시도에 같은 결과를 반환합니다.
+        """
+        session = self._sessions.get(upload_id)
+        if session is None:
+            return  # 처리 중 취소된 세션
+
+        session.result = result
+        session.processing = False
+        session.updated_at = time.time()
+        if os.path.exists(session.path):
+            os.unlink(session.path)
+        logger.info(f"업로드 처리 결과 저장: {upload_id}")
+
+    def release(self, upload_id: str) -> None:
+        """
+        일시적인 오류로 처리에 실패한 세션을 스풀 파일과 함께 유지 (finalize 재시도 가능)
+        """
+        session = self._sessions.get(upload_id)
+        if session is not None:
+            session.processing = False
+            session.updated_at = time.time()
+
+    def discard(self, upload_id: str, missing_ok: bool = False) -> None:
+        """
+        업로드 세션과 스풀 파일 삭제
+
+        Args:
+            upload_id: 업로드 세션 ID
+            missing_ok: True이면 세션이 없어도 오류를 발생시키지 않음
+        """
+        session = self._sessions.pop(upload_id, None)
+        if session is None:
+            if missing_ok:
+                return
+            raise UploadNotFoundError(f"업로드 세션을 찾을 수 없습니다: {upload_id}")
+
+        if os.path.exists(session.path):
+            os.unlink(session.path)
+        logger.info(f"업로드 세션 삭제: {upload_id}")
+
+    def cleanup_expired(self) -> None:
+        """
+        TTL이 지난 세션 정리 (처리 중인 세션 제외)
+        """
+        now = time.time()
+        expired = [
+            upload_id for upload_id, session in self._sessions.items()
+            if not session.processing and now - session.updated_at > self.ttl_seconds
+        ]
+        for upload_id in expired:
+            self.discard(upload_id, missing_ok=True)
+
+
+# 싱글톤 인스턴스
+_upload_manager_instance: Optional[UploadManager] = None
+
+
+def get_upload_manager(upload_dir: str = "", max_chunk_bytes: int = 8 * 1024 * 1024,
+                       ttl_seconds: int = 3600) -> UploadManager:
+    """
+    UploadManager 싱글톤 인스턴스를 반환
+    """
+    global _upload_manager_instance
+
+    if _upload_manager_instance is None:
+        _upload_manager_instance = UploadManager(
+            upload_dir or os.path.join(tempfile.gettempdir(), "voice_to_text_uploads"),
+            max_chunk_bytes,
+            ttl_seconds
+        )
+
+    return _upload_manager_instance
@@ -5,6 +5,7 @@ import toast, { Toaster } from 'react-hot-toast';
 import { useTranslation } from 'react-i18next';
 
 import { config } from '../config';
+import { uploadResumable } from '../resumableUpload';
 
 // API 엔드포인트 상수: config 파일에서 정의된 엔드포인트를 가져옵니다.
 const { API_ENDPOINTS } = config;
@@ -374,40 +375,15 @@ const Recorder = () => {
             const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
             console.log(`📦 오디오 Blob 크기: ${audioBlob.size} bytes`);
 
-            // 2. 백엔드 전송을 위한 FormData 생성
-            const formData = new FormData();
-            formData.append('audio', audioBlob, 'recording.webm');
-
-            console.log('📤 백엔드로 요청 전송 중...');
-
-            // 3. 백엔드 API 호출 (POST /transcribe)
-            const response = await fetch(API_ENDPOINTS.TRANSCRIBE, {
-                method: 'POST',
-                body: formData
+            // 2. 백엔드로 청크 업로드 (POST /uploads → /chunks → /finalize)
+            // 네트워크가 끊겨도 서버에 저장된 오프셋부터 이어서 전송합니다.
+            console.log('📤 백엔드로 청크 업로드 중...');
+            const data = await uploadResumable(audioBlob, 'recording.webm', {
+                onProgress: (sent, total) => console.log(`📤 업로드 진행: ${sent}/${total} bytes`)
             });
-
-            console.log(`📥 응답 상태: ${response.status} ${response.statusText}`);
-
-            if (!response.ok) {
-                const errorText = await response.text();
-                console.error('❌ API 오류 응답:', errorText);
-
-                // 에러 메시지 파싱 및 사용자 알림
-                let userMessage = '화자 분리 처리 중 오류가 발생했습니다.';
-                try {
-                    const errorData = JSON.parse(errorText);
-                    userMessage = errorData.detail || userMessage;
-                } catch (e) {
-                    // JSON 파싱 실패 시 기본 메시지 사용
-                }
-
-                throw new Error(userMessage);
-            }
-
-            const data = await response.json();
             console.log('✅ API 응답 데이터:', data);
 
-            // 4. 결과 처리
+            // 3. 결과 처리
             if (data.success && data.speakers) {
                 console.log(`👥 화자 수: ${data.speakers.length}`);
                 data.speakers.forEach((speaker, i) => {
@@ -11,6 +11,10 @@ export const config = {
     API_ENDPOINTS: {
         GET_TOKEN: `${API_BASE_URL}/token`,
         TRANSCRIBE: `${API_BASE_URL}/transcribe`,
+        UPLOADS: `${API_BASE_URL}/uploads`,
     },
+    // 재개 가능한 청크 업로드 설정
+    UPLOAD_CHUNK_SIZE: 1024 * 1024,
+    UPLOAD_MAX_RETRIES: 5,
     getWsUrl
 };
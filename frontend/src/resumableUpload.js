@@ -0,0 +1,169 @@
+/**
+ * 재개 가능한 청크 업로드 클라이언트
+ *
+ * 오디오를 청크 단위로 전송하고, 네트워크 오류가 나면 서버에 저장된
+ * 오프셋을 조회해 그 위치부터 이어서 전송합니다.
+ * 청크와 전체 파일의 SHA-256을 함께 보내 서버가 무결성을 검증하도록 합니다.
+ * 완료(finalize) 시 ElevenLabs의 일시적인 오류(503/504)는 업로드를 유지한 채 재시도합니다.
+ */
+import { config } from './config';
+
+const { API_ENDPOINTS, UPLOAD_CHUNK_SIZE, UPLOAD_MAX_RETRIES } = config;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// SHA-256 (hex). crypto.subtle은 보안 컨텍스트(https, localhost)에서만 사용 가능 - 없으면 검증 생략
+const sha256Hex = async (blob) => {
+    if (!globalThis.crypto?.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+};
+
+// 서버에 저장된 현재 오프셋 조회
+const fetchOffset = async (uploadId) => {
+    const response = await fetch(`${API_ENDPOINTS.UPLOADS}/${uploadId}`);
+    if (!response.ok) throw new Error('업로드 상태를 확인할 수 없습니다');
+    const status = await response.json();
+    return status.offset;
+};
+
+// offset부터 끝까지 청크 전송 (네트워크 오류 시 서버 오프셋을 확인해 재개)
+const uploadChunks = async (uploadId, blob, filename, offset, onProgress) => {
+    let retries = 0;
+
+    while (offset < blob.size) {
+        const chunk = blob.slice(offset, offset + UPLOAD_CHUNK_SIZE);
+        const chunkForm = new FormData();
+        chunkForm.append('chunk', chunk, filename);
+        chunkForm.append('offset', String(offset));
+
+        try {
+            const checksum = await sha256Hex(chunk);
+            if (checksum) chunkForm.append('checksum', checksum);
+
+            const response = await fetch(`${API_ENDPOINTS.UPLOADS}/${uploadId}/chunks`, {
+                method: 'POST',
+                body: chunkForm,
+            });
+
+            if (response.status === 409) {
+                // 서버 오프셋과 어긋남 - 서버가 알려준 위치부터 재전송
+                const { detail } = await response.json();
+                offset = detail.offset;
+                continue;
+            }
+            if (!response.ok) throw new Error(`청크 업로드 실패 (${response.status})`);
+
+            const status = await response.json();
+            offset = status.offset;
+            retries = 0;
+            onProgress?.(offset, blob.size);
+        } catch (err) {
+            if (++retries > UPLOAD_MAX_RETRIES) throw err;
+            console.warn(`청크 업로드 재시도 (${retries}/${UPLOAD_MAX_RETRIES}):`, err);
+            await sleep(500 * 2 ** retries);
+            try {
+                offset = await fetchOffset(uploadId);
+            } catch (statusErr) {
+                console.warn('업로드 상태 조회 실패:', statusErr);
+            }
+        }
+    }
+};
+
+/**
+ * 업로드 완료 요청 (finalize는 서버에서 멱등이므로 재시도해도 인식은 한 번만 수행됨)
+ *
+ * @returns {Promise<object>} 인식 결과, 또는 서버 데이터가 모자라면 { resumeFrom: 서버 오프셋 }
+ */
+const finalize = async (uploadId, finalizeForm) => {
+    let retries = 0;
+
+    for (;;) {
+        let response;
+        try {
+            response = await fetch(`${API_ENDPOINTS.UPLOADS}/${uploadId}/finalize`, {
+                method: 'POST',
+                body: finalizeForm,
+            });
+        } catch (err) {
+            // 응답을 받지 못함 - 서버는 처리 중이거나 이미 끝냈을 수 있음
+            if (++retries > UPLOAD_MAX_RETRIES) throw err;
+            console.warn(`업로드 완료 요청 재시도 (${retries}/${UPLOAD_MAX_RETRIES}):`, err);
+            await sleep(500 * 2 ** retries);
+            continue;
+        }
+
+        if (response.status === 409) {
+            const { detail } = await response.json();
+            if (detail.offset !== undefined) return { resumeFrom: detail.offset };
+            // 이전 요청이 아직 처리 중 - 끝나면 저장된 결과를 받음
+            await sleep(2000);
+            continue;
+        }
+        if ((response.status === 503 || response.status === 504) && retries < UPLOAD_MAX_RETRIES) {
+            // ElevenLabs 일시적 오류 - 서버에 업로드가 남아 있으므로 finalize만 재시도
+            retries++;
+            console.warn(`화자 분리 재시도 (${retries}/${UPLOAD_MAX_RETRIES}): ${response.status}`);
+            await sleep(1000 * 2 ** retries);
+            continue;
+        }
+        if (!response.ok) {
+            const errorText = await response.text();
+            console.error('❌ API 오류 응답:', errorText);
+
+            // 에러 메시지 파싱 (서버의 detail 메시지를 사용자에게 표시)
+            let userMessage = '화자 분리 처리 중 오류가 발생했습니다.';
+            try {
+                const errorData = JSON.parse(errorText);
+                if (typeof errorData.detail === 'string') userMessage = errorData.detail;
+            } catch (e) {
+                // JSON 파싱 실패 시 기본 메시지 사용
+            }
+            throw new Error(userMessage);
+        }
+
+        return response.json();
+    }
+};
+
+/**
+ * Blob을 청크로 업로드하고 음성 인식 결과를 반환
+ *
+ * @param {Blob} blob - 업로드할 오디오
+ * @param {string} filename - 파일명 (확장자 포함)
+ * @param {object} [options]
+ * @param {(sent: number, total: number) => void} [options.onProgress] - 진행률 콜백
+ * @returns {Promise<object>} POST /transcribe와 같은 형식의 결과 (success, fullTranscript, speakers, words)
+ */
+export const uploadResumable = async (blob, filename, { onProgress } = {}) => {
+    const createForm = new FormData();
+    createForm.append('filename', filename);
+    createForm.append('total_size', String(blob.size));
+
+    const createResponse = await fetch(API_ENDPOINTS.UPLOADS, {
+        method: 'POST',
+        body: createForm,
+    });
+    if (!createResponse.ok) throw new Error('업로드를 시작할 수 없습니다');
+    const { upload_id: uploadId } = await createResponse.json();
+
+    // 전체 파일 해시는 청크 업로드와 동시에 계산
+    const fileHashPromise = sha256Hex(blob);
+    let offset = 0;
+
+    for (;;) {
+        await uploadChunks(uploadId, blob, filename, offset, onProgress);
+
+        const finalizeForm = new FormData();
+        finalizeForm.append('total_size', String(blob.size));
+        const fileHash = await fileHashPromise;
+        if (fileHash) finalizeForm.append('sha256', fileHash);
+
+        const result = await finalize(uploadId, finalizeForm);
+        if (result.resumeFrom === undefined) return result;
+
+        // 서버가 받은 데이터가 모자람 - 서버 오프셋부터 다시 전송
+        offset = result.resumeFrom;
+    }
+};
@@ -16,6 +16,41 @@ class Settings(BaseSettings):
     MODEL_SIZE: str = "small"  # tiny, base, small, medium, large-v3
     DEVICE: str = "cpu"  # cpu or cuda
     COMPUTE_TYPE: str = "int8"  # int8, int8_float16, float16, float32
+    WARMUP_ON_STARTUP: bool = False  # True면 서버 시작 직후 백그라운드에서 모델 로드
+    
+    # CPU Tuning Settings (python main.py --tune 결과는 아래 항목과 COMPUTE_TYPE을 직접 지정하지 않은 경우에만 적용)
+    CPU_THREADS: int = 0  # 추론 1건당 스레드 수 (0이면 라이브러리 기본값)
+    NUM_WORKERS: int = 1  # 동시에 추론할 수 있는 모델 워커 수
+    MAX_CONCURRENCY: int = 1  # 동시에 실행할 인식 요청 수
+    TUNING_FILE: str = "cpu_tuning.json"  # 튜닝 결과 저장 경로
+    TUNING_FIXTURE: str = ""  # 벤치마크용 음성 파일 (--tune 실행 시 필수)
+    TUNING_LANGUAGE: str = ""  # 벤치마크 언어 코드 (비어 있으면 TUNING_FIXTURE에서 한 번 감지)
+    
+    # Language Pinning Settings (session_id별 감지 언어 고정)
+    LANGUAGE_PIN_THRESHOLD: float = 0.8  # 언어를 고정할 최소 감지 확률
+    LANGUAGE_REVERIFY_EVERY: int = 10  # 고정 언어를 N번 사용할 때마다 재검증 (0이면 안 함)
+    LANGUAGE_SESSION_TTL_SECONDS: int = 1800
+    LANGUAGE_MAX_SESSIONS: int = 1000
+    
+    # Speaker Diarization Settings (diarize=true 요청 시 로컬 CPU 화자 분리)
+    DIARIZATION_ENABLED: bool = True
+    DIARIZATION_EMBEDDING_MODEL: str = ""  # ONNX 화자 임베딩 모델 경로 (비어 있으면 MFCC 임베딩)
+    DIARIZATION_THRESHOLD: float = 0.0  # 같은 화자로 볼 코사인 유사도 (0이면 임베딩 방식별 기본값)
+    DIARIZATION_WINDOW_SECONDS: float = 1.5
+    DIARIZATION_HOP_SECONDS: float = 0.75
+    DIARIZATION_TARGET_RTF: float = 0.1  # 목표 실시간 배율 (초과 시 경고 로그)
+    DIARIZATION_THREADS: int = 0  # ONNX 추론 스레드 수 (0이면 기본값)
+    
+    # Resumable Upload Settings
+    UPLOAD_DIR: str = ""  # 비어 있으면 시스템 임시 디렉토리 사용
+    UPLOAD_MAX_CHUNK_BYTES: int = 8 * 1024 * 1024
+    UPLOAD_TTL_SECONDS: int = 3600
+    
+    # Early-start Settings (업로드 중 앞부분 미리 인식)
+    EARLY_START_ENABLED: bool = True
+    EARLY_START_MIN_SECONDS: float = 30.0  # 한 번에 인식할 최소 오디오 길이
+    EARLY_START_TAIL_SECONDS: float = 5.0  # 불완전할 수 있어 남겨두는 끝부분 길이
+    EARLY_START_MIN_BYTES: int = 512 * 1024  # 재디코딩 전 필요한 신규 데이터 크기
     
     # Server Settings
     BACKEND_PORT: int = 8001
@@ -1,37 +1,77 @@
 """
 Whisper Local Backend - FastAPI 서버
 """
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from routers import transcribe
-from config import settings
 import logging
 
-# 로깅 설정
+# 로깅 설정 (튜닝 결과 적용, 시작 단계 로그가 남도록 가장 먼저 설정)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
-# FastAPI 앱 초기화
-app = FastAPI(
-    title="Whisper Local Backend",
-    description="Faster-Whisper를 사용한 로컬 음성 인식 백엔드 서버",
-    version="1.0.0"
-)
+from startup_profile import startup_profile
 
-# CORS 설정
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
-)
+with startup_profile.phase("config"):
+    from config import settings
+    from services.cpu_tuner import apply_tuned_settings
+    apply_tuned_settings(settings)
+
+with startup_profile.phase("import"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from routers import transcribe, upload
+    from routers.transcribe import get_service
+    from contextlib import asynccontextmanager
+    import asyncio
+
+
+def _log_warm_up_result(future: asyncio.Future):
+    """
+    백그라운드 warm-up 실패를 로그로 남김 (결과를 기다리는 곳이 없으므로)
+    """
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"❌ 모델 warm-up 실패 (첫 요청 시 다시 로드를 시도합니다): {error}", exc_info=error)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 시작 리포트를 출력하고, WARMUP_ON_STARTUP이 켜져 있으면 백그라운드 스레드에서 모델을 미리 로드
+    (서버는 로딩을 기다리지 않고 바로 요청을 받음)
+    """
+    logger.info(startup_profile.format_report())
+    if settings.WARMUP_ON_STARTUP:
+        future = asyncio.get_running_loop().run_in_executor(None, get_service().warm_up)
+        future.add_done_callback(_log_warm_up_result)
+    yield
+
+
+with startup_profile.phase("app_build"):
+    # FastAPI 앱 초기화
+    app = FastAPI(
+        title="Whisper Local Backend",
+        description="Faster-Whisper를 사용한 로컬 음성 인식 백엔드 서버",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # CORS 설정
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["*"],
+    )
+
+    # 라우터 등록
+    app.include_router(transcribe.router, prefix="/api")
+    app.include_router(upload.router, prefix="/api")
 
-# 라우터 등록
-app.include_router(transcribe.router, prefix="/api")
 
 # 루트 엔드포인트
 @app.get("/")
@@ -45,11 +85,45 @@ async def root():
         "device": settings.DEVICE
     }
 
+@app.get("/startup", summary="콜드 스타트 시간 리포트")
+async def startup_report():
+    """
+    시작 단계별 소요 시간(ms)과 로드된 무거운 모듈 목록
+    (모델 로딩은 warm-up 또는 첫 요청 이후에 기록됨)
+    """
+    return startup_profile.report()
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=settings.BACKEND_PORT,
-        reload=True
-    )
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Whisper Local Backend")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="서버를 실행하지 않고 시작 단계별 소요 시간만 출력")
+    parser.add_argument("--warmup", action="store_true",
+                        help="--startup-report와 함께 사용 시 모델 로딩 시간도 측정")
+    parser.add_argument("--tune", action="store_true",
+                        help="이 호스트에서 연산 타입/스레드/동시 실행 수 조합을 벤치마크하고 최적값을 TUNING_FILE에 저장")
+    args = parser.parse_args()
+
+    if args.tune:
+        from services.cpu_tuner import run_tuning
+        try:
+            tuning = run_tuning(settings.MODEL_SIZE, settings.TUNING_FILE, settings.TUNING_FIXTURE,
+                                settings.TUNING_LANGUAGE)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"최적 설정: compute_type={tuning['compute_type']}, cpu_threads={tuning['cpu_threads']}, "
+              f"num_workers={tuning['num_workers']}, pool_size={tuning['pool_size']} "
+              f"(language={tuning['language']}, {tuning['throughput']:.2f} audio-sec/sec) → {settings.TUNING_FILE}")
+    elif args.startup_report:
+        if args.warmup:
+            get_service().warm_up()
+        print(startup_profile.format_report())
+    else:
+        import uvicorn
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=settings.BACKEND_PORT,
+            reload=True
+        )
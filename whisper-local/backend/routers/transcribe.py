@@ -4,9 +4,12 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
+import asyncio
+import io
 import logging
 
 from services.whisper_service import get_whisper_service
+from services.language_cache import get_language_cache, SOURCE_PINNED
 from config import settings
 
 router = APIRouter()
@@ -25,6 +28,14 @@ class WordData(BaseModel):
     start: float
     end: float
     probability: float
+    speaker_id: Optional[str] = None  # 화자 분리 시 화자 식별자 (예: speaker_0)
+
+class SpeakerSegment(BaseModel):
+    """화자별 텍스트 세그먼트 모델"""
+    speaker: str  # 화자 식별자 (예: speaker_0)
+    start: float  # 시작 시간 (초)
+    end: float    # 종료 시간 (초)
+    text: str     # 해당 구간의 텍스트
 
 class TranscriptionResponse(BaseModel):
     """음성 인식 결과 응답 모델"""
@@ -32,13 +43,88 @@ class TranscriptionResponse(BaseModel):
     text: str
     language: str
     language_probability: float
+    language_source: str = "detected"  # detected, pinned(세션 고정 언어 사용), request(요청에서 지정)
     segments: List[SegmentData]
     words: List[WordData]
+    speakers: List[SpeakerSegment] = []  # 화자 분리 요청 시 화자별 세그먼트
+    diarization_rtf: Optional[float] = None  # 화자 분리 실시간 배율 (처리 시간 / 오디오 길이)
+
+class SessionLanguageResponse(BaseModel):
+    """세션 고정 언어 응답 모델"""
+    session_id: str
+    pinned: bool
+    language: Optional[str] = None
+    language_probability: Optional[float] = None
+
+def get_service():
+    """설정값(튜닝 결과 포함)으로 WhisperService 싱글톤 반환"""
+    return get_whisper_service(
+        model_size=settings.MODEL_SIZE,
+        device=settings.DEVICE,
+        compute_type=settings.COMPUTE_TYPE,
+        cpu_threads=settings.CPU_THREADS,
+        num_workers=settings.NUM_WORKERS,
+        max_concurrency=settings.MAX_CONCURRENCY
+    )
+
+async def transcribe_with_diarization(source, language: Optional[str], diarizer,
+                                     num_speakers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    오디오를 한 번만 디코딩하여 음성 인식과 로컬 화자 분리에 함께 사용
+
+    Args:
+        source: 오디오 파일 경로 또는 파일 객체
+        language: 언어 코드. None이면 자동 감지
+        diarizer: DiarizationService
+        num_speakers: 화자 수 (알고 있는 경우)
+
+    Returns:
+        WhisperService.transcribe_audio 결과 + speakers, diarization_rtf
+    """
+    from faster_whisper import decode_audio
+    from services.diarization_service import SAMPLE_RATE
+
+    audio = await asyncio.to_thread(decode_audio, source, sampling_rate=SAMPLE_RATE)
+    result = await asyncio.to_thread(get_service().transcribe_array, audio, language, 5, True)
+    result.pop("segment_words")
+    logger.info(f"감지된 언어: {result['language']} (확률: {result['language_probability']:.2f})")
+
+    logger.info("로컬 화자 분리 중...")
+    words, speakers, rtf = await asyncio.to_thread(diarizer.diarize, audio, result["words"], num_speakers)
+    result.update(words=words, speakers=speakers, diarization_rtf=rtf)
+    return result
+
+def get_session_languages():
+    """설정값으로 LanguageCache 싱글톤 반환"""
+    return get_language_cache(
+        threshold=settings.LANGUAGE_PIN_THRESHOLD,
+        reverify_every=settings.LANGUAGE_REVERIFY_EVERY,
+        ttl_seconds=settings.LANGUAGE_SESSION_TTL_SECONDS,
+        max_sessions=settings.LANGUAGE_MAX_SESSIONS
+    )
+
+def get_diarizer():
+    """설정값으로 DiarizationService 싱글톤 반환 (numpy/onnxruntime은 처음 사용할 때 import)"""
+    if not settings.DIARIZATION_ENABLED:
+        raise HTTPException(status_code=400, detail="화자 분리가 비활성화되어 있습니다 (DIARIZATION_ENABLED=false)")
+    
+    from services.diarization_service import get_diarization_service
+    return get_diarization_service(
+        embedding_model=settings.DIARIZATION_EMBEDDING_MODEL,
+        threshold=settings.DIARIZATION_THRESHOLD,
+        window_seconds=settings.DIARIZATION_WINDOW_SECONDS,
+        hop_seconds=settings.DIARIZATION_HOP_SECONDS,
+        target_rtf=settings.DIARIZATION_TARGET_RTF,
+        num_threads=settings.DIARIZATION_THREADS
+    )
 
 @router.post("/transcribe", response_model=TranscriptionResponse, summary="오디오 파일 음성 인식")
 async def transcribe_audio(
     audio: UploadFile = File(..., description="음성 인식할 오디오 파일"),
-    language: Optional[str] = Form(None, description="언어 코드 (예: ko, en). 생략 시 자동 감지")
+    language: Optional[str] = Form(None, description="언어 코드 (예: ko, en). 생략 시 자동 감지"),
+    session_id: Optional[str] = Form(None, description="세션 ID. 지정 시 감지된 언어를 세션에 고정하여 이후 요청의 언어 감지를 생략"),
+    diarize: bool = Form(False, description="로컬 CPU 화자 분리 수행 여부"),
+    num_speakers: Optional[int] = Form(None, ge=1, description="화자 수 (알고 있는 경우). 생략 시 자동 추정")
 ) -> TranscriptionResponse:
     """
     **업로드된 오디오 파일을 텍스트로 변환합니다.**
@@ -47,42 +133,56 @@ async def transcribe_audio(
     
     - **Parameters**:
         - `audio`: 오디오 파일 (WebM, MP3, WAV 등)
-        - `language`: (Optional) 언어 코드. 지정하지 않으면 자동 감지
+        - `language`: (Optional) 언어 코드. 지정하지 않으면 자동 감지 (세션에 고정된 언어도 덮어씀)
+        - `session_id`: (Optional) 세션 ID. 감지 확률이 임계값 이상이면 언어를 세션에 고정하고,
+          같은 세션의 이후 요청은 언어 감지(인코더 1회)를 생략합니다. 주기적으로 재검증합니다.
+        - `diarize`: (Optional) true이면 로컬에서 화자 분리를 수행하여 `speakers`와 단어별 `speaker_id`를 채웁니다.
+        - `num_speakers`: (Optional) 화자 수. 생략 시 자동 추정
     
     - **Returns**:
         - `success`: 성공 여부
         - `text`: 전체 텍스트
         - `language`: 감지된 언어
         - `language_probability`: 언어 감지 확률
+        - `language_source`: 언어 결정 출처 (detected, pinned, request)
         - `segments`: 타임스탬프가 포함된 세그먼트 리스트
         - `words`: 단어별 타임스탬프 리스트
+        - `speakers`: 화자별 세그먼트 리스트 (diarize=true인 경우)
+        - `diarization_rtf`: 화자 분리 실시간 배율 (diarize=true인 경우)
     """
     logger.info("\n=== 음성 인식 API 호출 시작 ===")
     logger.info(f"파일명: {audio.filename}")
     logger.info(f"Content-Type: {audio.content_type}")
     logger.info(f"언어: {language or '자동 감지'}")
     
+    session_languages = get_session_languages()
+    model_language, language_source = session_languages.resolve(session_id, language)
+    if language_source == SOURCE_PINNED:
+        logger.info(f"세션 고정 언어 사용: {model_language} (session={session_id})")
+    
+    diarizer = get_diarizer() if diarize else None
+    
     try:
         # 오디오 파일 읽기
         audio_content = await audio.read()
         logger.info(f"오디오 파일 크기: {len(audio_content)} bytes")
         
-        # Whisper 서비스 가져오기
-        whisper_service = get_whisper_service(
-            model_size=settings.MODEL_SIZE,
-            device=settings.DEVICE,
-            compute_type=settings.COMPUTE_TYPE
-        )
-        
         # 음성 인식 수행
         logger.info("Whisper 모델로 음성 인식 중...")
-        result = await whisper_service.transcribe_audio(
-            audio_content=audio_content,
-            filename=audio.filename or "audio.webm",
-            language=language,
-            beam_size=5,
-            word_timestamps=True
-        )
+        if diarizer is not None:
+            # 화자 분리 시 디코딩한 오디오를 음성 인식과 함께 사용
+            result = await transcribe_with_diarization(
+                io.BytesIO(audio_content), model_language, diarizer, num_speakers
+            )
+        else:
+            result = await get_service().transcribe_audio(
+                audio_content=audio_content,
+                filename=audio.filename or "audio.webm",
+                language=model_language,
+                beam_size=5,
+                word_timestamps=True
+            )
+        result = session_languages.record(session_id, language_source, result)
         
         logger.info(f"✅ 음성 인식 완료")
         logger.info(f"  - 텍스트 길이: {len(result['text'])}")
@@ -117,5 +217,31 @@ async def health_check():
         "status": "healthy",
         "model_size": settings.MODEL_SIZE,
         "device": settings.DEVICE,
-        "compute_type": settings.COMPUTE_TYPE
+        "compute_type": settings.COMPUTE_TYPE,
+        "cpu_threads": settings.CPU_THREADS,
+        "num_workers": settings.NUM_WORKERS,
+        "max_concurrency": settings.MAX_CONCURRENCY
+    }
+
+@router.get("/sessions/{session_id}/language", response_model=SessionLanguageResponse, summary="세션 고정 언어 조회")
+async def get_session_language(session_id: str):
+    """
+    세션에 고정된 언어 조회
+    """
+    pinned = get_session_languages().get(session_id)
+    if pinned is None:
+        return {"session_id": session_id, "pinned": False}
+    return {
+        "session_id": session_id,
+        "pinned": True,
+        "language": pinned.language,
+        "language_probability": pinned.probability
     }
+
+@router.delete("/sessions/{session_id}/language", response_model=SessionLanguageResponse, summary="세션 고정 언어 해제")
+async def clear_session_language(session_id: str):
+    """
+    세션에 고정된 언어 해제 (다음 요청에서 언어를 다시 감지)
+    """
+    get_session_languages().clear(session_id)
+    return {"session_id": session_id, "pinned": False}
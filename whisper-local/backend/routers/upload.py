@@ -0,0 +1,250 @@
+"""
+재개 가능한(Resumable) 청크 업로드 API 라우터
+"""
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from typing import Optional
+from pydantic import BaseModel
+import asyncio
+import logging
+
+from services.upload_service import (
+    get_upload_manager,
+    UploadSession,
+    UploadNotFoundError,
+    UploadOffsetError,
+    UploadIntegrityError,
+    UploadBusyError,
+)
+from services.progressive_transcriber import ProgressiveTranscriber
+from routers.transcribe import (
+    TranscriptionResponse,
+    get_service,
+    get_session_languages,
+    get_diarizer,
+    transcribe_with_diarization,
+)
+from config import settings
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+# Pydantic Models
+class UploadStatusResponse(BaseModel):
+    """업로드 상태 응답 모델"""
+    upload_id: str
+    filename: str
+    offset: int  # 서버가 수신한 바이트 수 (다음 청크의 시작 오프셋)
+    total_size: Optional[int]
+    sha256: str  # 지금까지 수신한 데이터의 SHA-256
+    finalized: bool
+    processing: bool  # finalize 후 음성 인식 진행 중 여부
+    processed_seconds: float  # 업로드 중 미리 인식을 마친 오디오 길이 (초)
+
+
+def _get_manager():
+    return get_upload_manager(
+        upload_dir=settings.UPLOAD_DIR,
+        max_chunk_bytes=settings.UPLOAD_MAX_CHUNK_BYTES,
+        ttl_seconds=settings.UPLOAD_TTL_SECONDS
+    )
+
+
+def _raise_http(e: Exception):
+    """업로드 예외를 HTTP 오류로 변환"""
+    if isinstance(e, UploadNotFoundError):
+        raise HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, UploadOffsetError):
+        # 클라이언트는 offset부터 다시 전송하면 됨
+        raise HTTPException(status_code=409, detail={"message": str(e), "offset": e.expected_offset})
+    if isinstance(e, UploadIntegrityError):
+        raise HTTPException(status_code=422, detail=str(e))
+    if isinstance(e, UploadBusyError):
+        # 이전 finalize 요청이 아직 처리 중 - 잠시 후 다시 호출하면 결과를 받을 수 있음
+        raise HTTPException(status_code=409, detail={"message": str(e), "processing": True})
+    raise e
+
+
+def _schedule_early_start(session: UploadSession):
+    """
+    이전 단계가 끝났고 새 데이터가 충분하면 백그라운드에서 앞부분 인식 시작
+    """
+    transcriber = session.transcriber
+    if transcriber is None or not transcriber.should_advance(session.offset):
+        return
+    if session.processing_task and not session.processing_task.done():
+        return
+
+    session.processing_task = asyncio.create_task(transcriber.advance(session.path, session.offset))
+
+
+@router.post("/uploads", response_model=UploadStatusResponse, summary="재개 가능한 업로드 생성")
+async def create_upload(
+    filename: str = Form("audio.webm", description="원본 파일명 (확장자 포함)"),
+    total_size: Optional[int] = Form(None, description="전체 파일 크기 (bytes). 알 수 없으면 생략"),
+    language: Optional[str] = Form(None, description="언어 코드 (예: ko, en). 생략 시 자동 감지"),
+    session_id: Optional[str] = Form(None, description="세션 ID. 지정 시 세션에 고정된 언어를 사용하고 감지 결과를 고정"),
+    diarize: bool = Form(False, description="로컬 CPU 화자 분리 수행 여부"),
+    num_speakers: Optional[int] = Form(None, ge=1, description="화자 수 (알고 있는 경우). 생략 시 자동 추정")
+):
+    """
+    **청크 업로드 세션을 생성합니다.**
+
+    반환된 `upload_id`로 청크를 순서대로 전송한 뒤 `/uploads/{upload_id}/finalize`를 호출합니다.
+    연결이 끊긴 경우 `GET /uploads/{upload_id}`로 `offset`을 확인하고 그 위치부터 재전송합니다.
+    `diarize=true`이면 업로드 중 확정된 구간마다 화자를 증분 군집화합니다.
+    """
+    diarizer = get_diarizer() if diarize else None
+    model_language, language_source = get_session_languages().resolve(session_id, language)
+
+    try:
+        session = _get_manager().create(filename, total_size, model_language)
+    except Exception as e:
+        _raise_http(e)
+
+    session.session_id = session_id
+    session.language_source = language_source
+    session.diarizer = diarizer
+    session.num_speakers = num_speakers
+
+    if settings.EARLY_START_ENABLED:
+        session.transcriber = ProgressiveTranscriber(
+            get_service(),
+            language=model_language,
+            min_seconds=settings.EARLY_START_MIN_SECONDS,
+            tail_seconds=settings.EARLY_START_TAIL_SECONDS,
+            min_new_bytes=settings.EARLY_START_MIN_BYTES,
+            speaker_stream=diarizer.create_stream(num_speakers) if diarizer else None
+        )
+
+    return session.to_dict()
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadStatusResponse, summary="업로드 상태 조회")
+async def get_upload_status(upload_id: str):
+    """
+    업로드 진행 상태 조회 (재개 시 다음 오프셋 확인용)
+    """
+    try:
+        return _get_manager().get(upload_id).to_dict()
+    except Exception as e:
+        _raise_http(e)
+
+
+@router.post("/uploads/{upload_id}/chunks", response_model=UploadStatusResponse, summary="청크 추가")
+async def append_chunk(
+    upload_id: str,
+    chunk: UploadFile = File(..., description="청크 데이터"),
+    offset: int = Form(..., description="청크의 시작 바이트 오프셋"),
+    checksum: Optional[str] = Form(None, description="청크의 SHA-256 (hex). 지정 시 검증")
+):
+    """
+    **청크를 지정한 오프셋에 추가합니다.**
+
+    - 오프셋이 서버 오프셋보다 크면 `409`와 함께 서버 오프셋을 반환합니다.
+    - 이미 받은 구간과 겹치는 재전송은 겹치는 부분만 건너뛰고 받아들입니다.
+    - 조기 처리가 켜져 있으면 완성된 앞부분의 인식을 백그라운드에서 시작합니다.
+    """
+    manager = _get_manager()
+    try:
+        data = await chunk.read()
+        session = await manager.append(upload_id, offset, data, checksum)
+    except Exception as e:
+        _raise_http(e)
+
+    _schedule_early_start(session)
+    return session.to_dict()
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=TranscriptionResponse, summary="업로드 완료 및 음성 인식")
+async def finalize_upload(
+    upload_id: str,
+    total_size: Optional[int] = Form(None, description="전체 파일 크기 (bytes). 지정 시 검증"),
+    sha256: Optional[str] = Form(None, description="전체 파일의 SHA-256 (hex). 지정 시 검증")
+):
+    """
+    **업로드를 완료하고 음성 인식 결과를 반환합니다.**
+
+    크기와 체크섬을 검증한 뒤, 업로드 중 미리 인식한 구간을 제외한 나머지만 인식하여 합칩니다.
+    응답 형식은 `POST /transcribe`와 같습니다.
+
+    - 이전 finalize 요청이 처리 중이면 `409`를 반환합니다 (`detail.processing = true`).
+    - 이미 처리된 업로드를 다시 finalize하면 저장된 결과를 그대로 반환합니다.
+    """
+    manager = _get_manager()
+    try:
+        session = await manager.finalize(upload_id, total_size, sha256)
+    except Exception as e:
+        _raise_http(e)
+
+    if session.result is not None:
+        # 이미 처리된 업로드에 대한 재시도 - 저장된 결과 반환
+        return {
+            "success": True,
+            **session.result
+        }
+
+    result = None
+    try:
+        result = await _transcribe_session(session)
+        result = get_session_languages().record(session.session_id, session.language_source, result)
+
+        logger.info(f"✅ 업로드 음성 인식 완료: {upload_id} ({len(result['segments'])}개 세그먼트)")
+        return {
+            "success": True,
+            **result
+        }
+
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"❌ 업로드 음성 인식 오류: {error_msg}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"음성 인식 중 오류가 발생했습니다: {error_msg}")
+
+    finally:
+        if result is not None:
+            manager.complete(upload_id, result)
+        else:
+            manager.discard(upload_id, missing_ok=True)
+
+
+async def _transcribe_session(session: UploadSession):
+    """
+    완료된 업로드 세션의 음성 인식 (조기 처리 결과가 있으면 나머지 구간만 인식)
+    """
+    if session.transcriber is not None:
+        # 진행 중인 조기 처리 단계가 끝나기를 기다린 후 나머지 처리
+        if session.processing_task is not None:
+            try:
+                await session.processing_task
+            except Exception as e:
+                logger.warning(f"조기 처리 단계 실패 (나머지 처리에서 계속): {e}")
+        return await session.transcriber.finish(session.path)
+
+    if session.diarizer is not None:
+        return await transcribe_with_diarization(
+            session.path, session.language, session.diarizer, session.num_speakers
+        )
+
+    with open(session.path, "rb") as spool:
+        audio_content = spool.read()
+    return await get_service().transcribe_audio(
+        audio_content=audio_content,
+        filename=session.filename,
+        language=session.language,
+        beam_size=5,
+        word_timestamps=True
+    )
+
+
+@router.delete("/uploads/{upload_id}", summary="업로드 취소")
+async def cancel_upload(upload_id: str):
+    """
+    업로드 세션과 스풀 파일 삭제
+    """
+    try:
+        _get_manager().discard(upload_id)
+    except Exception as e:
+        _raise_http(e)
+    return {"success": True}
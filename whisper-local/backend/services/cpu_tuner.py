@@ -0,0 +1,371 @@
+"""
+CPU 자동 튜닝 서비스 (스레드 수, 연산 타입, 동시 실행 수)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# 모델별 대략적인 파라미터 수 (메모리 추정용)
+MODEL_PARAMS = {
+    "tiny": 39e6,
+    "base": 74e6,
+    "small": 244e6,
+    "medium": 769e6,
+    "large-v1": 1550e6,
+    "large-v2": 1550e6,
+    "large-v3": 1550e6,
+}
+
+# 연산 타입별 가중치 1개당 바이트 수
+BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float32": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# CPU에서 튜닝 대상으로 고려하는 연산 타입
+# (CTranslate2는 CPU에서 int8을 int8_float32로 처리하므로 int8_float32는 따로 측정하지 않음)
+CPU_COMPUTE_TYPES = ["int8", "float32"]
+
+# 튜닝 결과로 덮어쓸 수 있는 설정 항목
+TUNED_FIELDS = ["COMPUTE_TYPE", "CPU_THREADS", "NUM_WORKERS", "MAX_CONCURRENCY"]
+
+
+def _read_cpu_flags() -> List[str]:
+    """CPU 명령어 집합(ISA) 플래그 목록"""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    if line.startswith(("flags", "Features")):
+                        return line.split(":", 1)[1].split()
+        elif system == "Darwin":
+            output = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.features", "machdep.cpu.leaf7_features"],
+                capture_output=True, text=True, timeout=5
+            ).stdout
+            return output.lower().split()
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"CPU 플래그 조회 실패: {e}")
+    return []
+
+
+def _physical_cores(logical: int) -> int:
+    """물리 코어 수 (확인할 수 없으면 논리 코어 수)"""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            cores = set()
+            physical_id = core_id = None
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    if line.startswith("physical id"):
+                        physical_id = line.split(":", 1)[1].strip()
+                    elif line.startswith("core id"):
+                        core_id = line.split(":", 1)[1].strip()
+                    elif not line.strip() and core_id is not None:
+                        cores.add((physical_id, core_id))
+                        physical_id = core_id = None
+            if core_id is not None:
+                cores.add((physical_id, core_id))
+            if cores:
+                return min(len(cores), logical)
+        elif system == "Darwin":
+            output = subprocess.run(
+                ["sysctl", "-n", "hw.physicalcpu"], capture_output=True, text=True, timeout=5
+            ).stdout
+            return min(int(output.strip()), logical)
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        logger.debug(f"물리 코어 수 조회 실패: {e}")
+    return logical
+
+
+def _available_memory_bytes() -> Optional[int]:
+    """사용 가능한 메모리 (바이트, 확인할 수 없으면 None)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        # /proc/meminfo가 없는 환경 (macOS 등) - 전체 물리 메모리로 대체
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _supported_compute_types(flags: List[str]) -> List[str]:
+    """이 CPU에서 CTranslate2가 지원하는 연산 타입"""
+    try:
+        import ctranslate2
+        supported = set(ctranslate2.get_supported_compute_types("cpu"))
+    except Exception as e:
+        # ctranslate2를 불러올 수 없으면 ISA 플래그로 추정 (int8은 AVX2/NEON 필요)
+        logger.debug(f"ctranslate2 지원 타입 조회 실패, ISA 플래그로 추정: {e}")
+        supported = {"float32"}
+        if "avx2" in flags or "neon" in flags or "asimd" in flags or platform.machine() == "arm64":
+            supported.add("int8")
+    return [compute_type for compute_type in CPU_COMPUTE_TYPES if compute_type in supported]
+
+
+def probe_host() -> Dict[str, Any]:
+    """
+    호스트 CPU/메모리 정보 조회
+
+    Returns:
+        Dict containing:
+            - logical_cores: 이 프로세스가 사용할 수 있는 논리 코어 수
+            - physical_cores: 물리 코어 수
+            - isa: 주요 명령어 집합 지원 여부 (avx, avx2, avx512, vnni, fma, neon)
+            - compute_types: 지원되는 CPU 연산 타입
+            - available_memory_mb: 사용 가능한 메모리 (MB)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        logical = len(os.sched_getaffinity(0))  # 컨테이너 CPU 제한 반영
+    else:
+        logical = os.cpu_count() or 1
+
+    flags = _read_cpu_flags()
+    memory = _available_memory_bytes()
+
+    return {
+        "machine": platform.machine(),
+        "logical_cores": logical,
+        "physical_cores": _physical_cores(logical),
+        "isa": {
+            "avx": "avx" in flags,
+            "avx2": "avx2" in flags,
+            "avx512": any(flag.startswith("avx512") for flag in flags),
+            "vnni": any("vnni" in flag for flag in flags),
+            "fma": "fma" in flags,
+            "neon": "neon" in flags or "asimd" in flags or platform.machine() == "arm64",
+        },
+        "compute_types": _supported_compute_types(flags),
+        "available_memory_mb": memory // (1024 * 1024) if memory else None,
+    }
+
+
+def estimate_memory_mb(model_size: str, compute_type: str, num_workers: int) -> float:
+    """
+    모델 메모리 사용량 대략 추정 (가중치 + 워커별 작업 메모리)
+    """
+    params = MODEL_PARAMS.get(model_size, MODEL_PARAMS["large-v3"])
+    weights_mb = params * BYTES_PER_PARAM.get(compute_type, 4) / (1024 * 1024)
+    return weights_mb * (1 + 0.25 * num_workers) + 150 * num_workers
+
+
+def candidate_configs(host: Dict[str, Any], model_size: str) -> List[Dict[str, Any]]:
+    """
+    벤치마크할 (compute_type, cpu_threads, num_workers, pool_size) 조합 생성
+
+    물리 코어를 동시 실행 수로 나누어 스레드를 배정하므로 코어를 과다 할당하지 않으며,
+    사용 가능한 메모리를 넘는 조합은 제외합니다.
+    """
+    cores = max(1, host["physical_cores"])
+    memory_mb = host["available_memory_mb"]
+
+    worker_options = sorted({w for w in (1, 2, 4, cores // 2) if 1 <= w <= cores})
+    candidates = []
+
+    for compute_type in host["compute_types"] or ["float32"]:
+        for num_workers in worker_options:
+            # pool_size == num_workers: 워커당 요청 1개, pool_size == 2 * num_workers: 대기 없이 워커 교체
+            for pool_size in sorted({num_workers, min(cores, num_workers * 2)}):
+                cpu_threads = max(1, cores // pool_size)
+                if memory_mb and estimate_memory_mb(model_size, compute_type, num_workers) > memory_mb * 0.8:
+                    continue
+                candidates.append({
+                    "compute_type": compute_type,
+                    "cpu_threads": cpu_threads,
+                    "num_workers": num_workers,
+                    "pool_size": pool_size,
+                })
+
+    return candidates
+
+
+def _load_fixture(fixture_path: str, seconds: float):
+    """
+    벤치마크용 음성 오디오 로드
+
+    디코딩 시간은 생성하는 토큰 수에 크게 좌우되므로, 비음성 신호로는 실제 부하를 측정할 수 없어
+    실제 음성 파일(TUNING_FIXTURE)을 필수로 요구합니다.
+    """
+    if not fixture_path:
+        raise ValueError("TUNING_FIXTURE에 벤치마크용 음성 파일(10초 이상 권장)을 지정하세요")
+    if not os.path.exists(fixture_path):
+        raise ValueError(f"TUNING_FIXTURE 파일을 찾을 수 없습니다: {fixture_path}")
+
+    from faster_whisper import decode_audio
+    audio = decode_audio(fixture_path, sampling_rate=SAMPLE_RATE)
+    if len(audio) < seconds * SAMPLE_RATE:
+        logger.warning(f"TUNING_FIXTURE가 {seconds:.0f}초보다 짧아 측정 편차가 클 수 있습니다 "
+                       f"({len(audio) / SAMPLE_RATE:.1f}초)")
+    return audio[:int(seconds * SAMPLE_RATE)]
+
+
+def benchmark_candidate(model_size: str, candidate: Dict[str, Any], audio,
+                        language: Optional[str] = None, rounds: int = 2) -> Tuple[float, str]:
+    """
+    하나의 조합으로 pool_size개 요청을 동시에 처리하여 처리량 측정
+
+    실제 요청과 같은 방식(beam_size=5, word_timestamps=True)으로 디코딩합니다.
+    language가 없으면 첫(측정 제외) 실행에서 감지한 언어를 고정하여 측정합니다.
+
+    Returns:
+        (처리량 (초당 처리한 오디오 길이, 클수록 좋음), 사용한 언어)
+    """
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=candidate["compute_type"],
+        cpu_threads=candidate["cpu_threads"],
+        num_workers=candidate["num_workers"]
+    )
+
+    def run_once(_):
+        segments, info = model.transcribe(
+            audio, language=language, beam_size=5, word_timestamps=True, vad_filter=False
+        )
+        list(segments)
+        return info.language
+
+    # 첫 실행은 초기화 비용이 포함되므로 측정에서 제외
+    language = run_once(None)
+
+    jobs = candidate["pool_size"] * rounds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=candidate["pool_size"]) as pool:
+        list(pool.map(run_once, range(jobs)))
+    elapsed = time.perf_counter() - start
+
+    return jobs * len(audio) / SAMPLE_RATE / elapsed, language
+
+
+def run_tuning(model_size: str, output_path: str, fixture_path: str,
+               language: str = "", fixture_seconds: float = 10.0) -> Dict[str, Any]:
+    """
+    호스트를 조사하고 후보 조합을 벤치마크하여 가장 빠른 설정을 저장
+
+    Args:
+        model_size: 튜닝할 모델 크기
+        output_path: 결과를 저장할 JSON 파일 경로
+        fixture_path: 벤치마크용 음성 파일 (필수)
+        language: 벤치마크 언어 코드 (비어 있으면 첫 조합에서 한 번 감지하여 고정)
+        fixture_seconds: 벤치마크에 사용할 오디오 길이 (초)
+
+    Returns:
+        저장된 튜닝 결과
+    """
+    audio = _load_fixture(fixture_path, fixture_seconds)
+
+    host = probe_host()
+    logger.info(f"호스트 정보: {host}")
+
+    candidates = candidate_configs(host, model_size)
+    if not candidates:
+        raise ValueError("메모리가 부족하여 벤치마크할 수 있는 조합이 없습니다. 더 작은 모델을 사용해보세요.")
+
+    language = language or None
+    results = []
+    for i, candidate in enumerate(candidates, 1):
+        try:
+            throughput, language = benchmark_candidate(model_size, candidate, audio, language)
+        except Exception as e:
+            logger.warning(f"[{i}/{len(candidates)}] {candidate} 실패: {e}")
+            continue
+        logger.info(f"[{i}/{len(candidates)}] {candidate} → {throughput:.2f} audio-sec/sec")
+        results.append({**candidate, "throughput": round(throughput, 3)})
+
+    if not results:
+        raise RuntimeError("모든 조합의 벤치마크가 실패했습니다")
+
+    best = max(results, key=lambda result: result["throughput"])
+    tuning = {
+        "model_size": model_size,
+        "device": "cpu",
+        "compute_type": best["compute_type"],
+        "cpu_threads": best["cpu_threads"],
+        "num_workers": best["num_workers"],
+        "pool_size": best["pool_size"],
+        "throughput": best["throughput"],
+        "language": language,
+        "host": host,
+        "results": results,
+        "tuned_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(tuning, f, indent=2, ensure_ascii=False)
+    logger.info(f"✅ 튜닝 완료: {best} → {output_path}")
+
+    return tuning
+
+
+def apply_tuned_settings(settings) -> Optional[Dict[str, Any]]:
+    """
+    저장된 튜닝 결과를 설정에 반영
+
+    같은 모델/CPU 디바이스/코어 수로 튜닝한 결과만 적용합니다.
+    네 항목은 함께 측정한 조합이므로 일부만 섞어 쓰지 않도록, 환경 변수나 .env로
+    하나라도 직접 지정했다면 아무것도 적용하지 않습니다.
+
+    Returns:
+        적용한 튜닝 결과 (적용하지 않았으면 None)
+    """
+    path = settings.TUNING_FILE
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            tuning = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"튜닝 파일을 읽을 수 없습니다 ({path}): {e}")
+        return None
+
+    if settings.DEVICE != "cpu" or tuning.get("model_size") != settings.MODEL_SIZE:
+        logger.info(f"튜닝 결과를 적용하지 않음: 현재 설정({settings.MODEL_SIZE}/{settings.DEVICE})과 다름")
+        return None
+
+    logical = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    if tuning.get("host", {}).get("logical_cores") != logical:
+        logger.info("튜닝 결과를 적용하지 않음: 튜닝한 호스트와 코어 수가 다름 (다시 튜닝하세요)")
+        return None
+
+    values = {
+        "COMPUTE_TYPE": tuning["compute_type"],
+        "CPU_THREADS": tuning["cpu_threads"],
+        "NUM_WORKERS": tuning["num_workers"],
+        "MAX_CONCURRENCY": tuning["pool_size"],
+    }
+    explicit = [field for field in TUNED_FIELDS if field in settings.model_fields_set]
+    if explicit:
+        logger.warning(f"튜닝 결과를 적용하지 않음: {', '.join(explicit)}을(를) 직접 지정함 "
+                       f"(튜닝 값 {values}을 쓰려면 해당 항목을 .env에서 제거하세요)")
+        return None
+
+    for field, value in values.items():
+        setattr(settings, field, value)
+
+    logger.info(f"튜닝 결과 적용: {values}")
+    return tuning
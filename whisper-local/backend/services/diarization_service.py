@@ -0,0 +1,575 @@
+"""
+로컬 CPU 화자 분리(Speaker Diarization) 서비스
+"""
+from typing import List, Dict, Any, Optional, Tuple, Union, BinaryIO
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400  # 25ms
+FRAME_HOP = 160  # 10ms
+N_FFT = 512
+N_MELS = 80
+N_MFCC = 20
+
+# 임베딩 방식별 기본 코사인 유사도 임계값 (이 값 이상이면 같은 화자)
+DEFAULT_THRESHOLDS = {
+    "onnx": 0.5,
+    "mfcc": 0.92,
+}
+
+
+def _mel_filterbank(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """(n_mels, n_fft // 2 + 1) 삼각 멜 필터뱅크"""
+    def hz_to_mel(hz):
+        return 1127.0 * np.log(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (np.exp(mel / 1127.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(20.0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = mel_to_hz(mel_points) * n_fft / sample_rate
+    freqs = np.arange(n_fft // 2 + 1)
+
+    lower = bins[:-2, None]
+    center = bins[1:-1, None]
+    upper = bins[2:, None]
+    rising = (freqs[None, :] - lower) / (center - lower)
+    falling = (upper - freqs[None, :]) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+_MEL_FILTERS = _mel_filterbank()
+_WINDOW = np.hamming(FRAME_LENGTH).astype(np.float32)
+# DCT-II 행렬 (멜 → 켑스트럼), c0(에너지)는 제외
+_DCT = np.cos(np.pi / N_MELS * (np.arange(N_MELS)[None, :] + 0.5) * np.arange(1, N_MFCC)[:, None]).astype(np.float32)
+
+
+def log_mel_fbank(windows: np.ndarray) -> np.ndarray:
+    """
+    같은 길이의 오디오 창 묶음을 로그 멜 필터뱅크로 변환
+
+    Args:
+        windows: (창 개수, 샘플 수) float32 배열
+
+    Returns:
+        (창 개수, 프레임 수, N_MELS) 배열
+    """
+    n_frames = 1 + (windows.shape[1] - FRAME_LENGTH) // FRAME_HOP
+    index = np.arange(FRAME_LENGTH)[None, :] + FRAME_HOP * np.arange(n_frames)[:, None]
+    frames = windows[:, index]  # (B, F, FRAME_LENGTH)
+    frames = frames - frames.mean(axis=2, keepdims=True)
+    spectrum = np.abs(np.fft.rfft(frames * _WINDOW, n=N_FFT, axis=2)) ** 2
+    return np.log(spectrum.astype(np.float32) @ _MEL_FILTERS.T + 1e-6)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화"""
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-8)
+
+
+class MfccEmbedder:
+    """
+    MFCC 통계(평균 + 표준편차) 기반 임베딩 (추가 모델 없이 NumPy만 사용)
+
+    신경망 화자 임베딩보다 정확도가 낮으므로 DIARIZATION_EMBEDDING_MODEL을 설정할 수 없을 때의 대안입니다.
+    """
+
+    name = "mfcc"
+
+    def embed(self, windows: np.ndarray) -> np.ndarray:
+        cepstra = log_mel_fbank(windows) @ _DCT.T  # (B, F, N_MFCC - 1)
+        return np.concatenate([cepstra.mean(axis=1), cepstra.std(axis=1)], axis=1)
+
+
+class OnnxEmbedder:
+    """
+    ONNX 화자 임베딩 모델 (WeSpeaker ResNet/ECAPA 등 (B, T, 80) fbank 입력 모델)
+
+    onnxruntime은 faster-whisper 설치 시 함께 설치됩니다.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, num_threads: int = 0):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self._session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self._session.get_inputs()[0].name
+
+    def embed(self, windows: np.ndarray) -> np.ndarray:
+        features = log_mel_fbank(windows)
+        features = features - features.mean(axis=1, keepdims=True)  # CMN
+        return self._session.run(None, {self._input_name: features.astype(np.float32)})[0]
+
+
+class OnlineSpeakerClusterer:
+    """
+    임베딩을 도착 순서대로 가장 가까운 화자 중심(centroid)에 배정하는 증분 클러스터러
+
+    스트리밍 세션에서 청크가 도착할 때마다 이어서 사용할 수 있으며,
+    나중에 서로 가까워진 화자는 merge_similar()로 합치고 resolve()로 라벨을 갱신합니다.
+    """
+
+    def __init__(self, threshold: float, max_speakers: int = 20):
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.sums: Optional[np.ndarray] = None  # 화자별 정규화 임베딩 합
+        self.counts: List[int] = []
+        self._parent: List[int] = []  # 합쳐진 화자의 대표 라벨
+
+    @property
+    def num_speakers(self) -> int:
+        return 0 if self.sums is None else len(self.sums)
+
+    @property
+    def roots(self) -> List[int]:
+        """합쳐지지 않고 남아 있는 화자 라벨 목록"""
+        return [label for label, parent in enumerate(self._parent) if parent == label]
+
+    @property
+    def num_active(self) -> int:
+        """합쳐지지 않고 남아 있는 화자 수"""
+        return len(self.roots)
+
+    def assign(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        임베딩들을 화자에 배정하고 중심을 갱신
+
+        Returns:
+            (임베딩 개수,) 화자 라벨 배열
+        """
+        embeddings = _normalize(embeddings)
+        labels = np.empty(len(embeddings), dtype=np.int64)
+
+        for i, embedding in enumerate(embeddings):
+            if self.sums is not None:
+                similarities = _normalize(self.sums) @ embedding
+                similarities[self._merged] = -np.inf  # 다른 화자로 합쳐진 중심은 제외
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold or self.num_active >= self.max_speakers:
+                    self.sums[best] += embedding
+                    self.counts[best] += 1
+                    labels[i] = best
+                    continue
+
+            # 새 화자
+            self.sums = embedding[None, :].copy() if self.sums is None else np.vstack([self.sums, embedding])
+            self.counts.append(1)
+            self._parent.append(len(self._parent))
+            labels[i] = len(self.sums) - 1
+
+        return labels
+
+    def merge_similar(self) -> None:
+        """
+        중심이 임계값 이상으로 가까워진 화자들을 합침 (먼저 등장한 라벨 유지)
+        """
+        if self.num_speakers < 2:
+            return
+        roots = self.roots
+        groups = _agglomerate(self.sums[roots], self.threshold)
+        for root, group in zip(roots, groups):
+            target = roots[group]
+            if target != root:
+                self._parent[root] = target
+                self.sums[target] += self.sums[root]
+                self.counts[target] += self.counts[root]
+
+    @property
+    def _merged(self) -> np.ndarray:
+        """다른 화자로 합쳐진 라벨 여부"""
+        return np.array([parent != label for label, parent in enumerate(self._parent)], dtype=bool)
+
+    def resolve(self, labels: np.ndarray) -> np.ndarray:
+        """
+        합쳐진 화자를 반영한 최종 라벨
+        """
+        return np.array([self._find(int(label)) for label in labels], dtype=np.int64)
+
+    def _find(self, label: int) -> int:
+        while self._parent[label] != label:
+            label = self._parent[label]
+        return label
+
+
+def _agglomerate(centroid_sums: np.ndarray, threshold: float, num_speakers: Optional[int] = None) -> List[int]:
+    """
+    화자 중심들에 대한 병합 군집화 (가장 가까운 쌍부터 합침)
+
+    Args:
+        centroid_sums: (k, d) 화자별 임베딩 합
+        threshold: 병합할 최소 코사인 유사도 (num_speakers 지정 시 무시)
+        num_speakers: 최종 화자 수 (지정 시 이 개수가 될 때까지 병합)
+
+    Returns:
+        각 중심이 속한 최종 그룹 번호 리스트
+    """
+    sums = centroid_sums.astype(np.float64).copy()
+    groups = list(range(len(sums)))
+    alive = list(range(len(sums)))
+
+    while len(alive) > 1:
+        if num_speakers and len(alive) <= num_speakers:
+            break
+        centroids = _normalize(sums[alive])
+        similarities = centroids @ centroids.T
+        np.fill_diagonal(similarities, -np.inf)
+        i, j = np.unravel_index(int(np.argmax(similarities)), similarities.shape)
+        if not num_speakers and similarities[i, j] < threshold:
+            break
+
+        keep, drop = alive[min(i, j)], alive[max(i, j)]
+        sums[keep] += sums[drop]
+        groups = [keep if group == drop else group for group in groups]
+        alive.remove(drop)
+
+    return groups
+
+
+class SpeakerStream:
+    """
+    스트리밍 세션용 증분 화자 분리 상태
+
+    조기 처리(early-start)로 확정된 구간이 도착할 때마다 process()로 단어에 화자를 배정하고,
+    마지막에 finalize()로 합쳐진 화자를 반영하여 라벨을 정리합니다.
+    """
+
+    def __init__(self, service: "DiarizationService", num_speakers: Optional[int] = None,
+                 max_speakers: int = 20):
+        """
+        Args:
+            service: 임베딩 추출에 사용할 DiarizationService
+            num_speakers: 화자 수 (알고 있는 경우). finalize에서 이 개수까지 병합
+            max_speakers: 증분 군집화 중 유지할 최대 화자 수
+        """
+        self.service = service
+        self.num_speakers = num_speakers
+        self.clusterer = OnlineSpeakerClusterer(service.threshold, max_speakers)
+        self.processing_seconds = 0.0
+        self.audio_seconds = 0.0
+        # 창이 없는 구간의 단어를 finalize에서 배정하기 위한 창 위치와 라벨
+        self._starts: List[np.ndarray] = []
+        self._ends: List[np.ndarray] = []
+        self._labels: List[np.ndarray] = []
+
+    def process(self, audio: np.ndarray, words: List[Dict[str, Any]], offset: float = 0.0) -> None:
+        """
+        오디오 구간의 화자를 추정하여 words에 _label(내부 라벨)을 기록 (블로킹 호출)
+
+        음성 창이 없는 구간의 단어는 라벨 없이 두었다가 finalize에서 가장 가까운 창의 화자로 배정합니다.
+        """
+        start_time = time.perf_counter()
+        starts, ends, embeddings = self.service.extract(audio, offset)
+        if len(embeddings):
+            labels = self.clusterer.assign(embeddings)
+            self.clusterer.merge_similar()
+            assign_word_labels(words, starts, ends, labels)
+            self._starts.append(starts)
+            self._ends.append(ends)
+            self._labels.append(labels)
+        self.processing_seconds += time.perf_counter() - start_time
+        self.audio_seconds += len(audio) / SAMPLE_RATE
+
+    def finalize(self, words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        합쳐진 화자를 반영하여 speaker_id를 확정하고 화자별 세그먼트 반환
+        """
+        start_time = time.perf_counter()
+        if self._labels:
+            unlabeled = [word for word in words if "_label" not in word]
+            assign_word_labels(
+                unlabeled, np.concatenate(self._starts), np.concatenate(self._ends), np.concatenate(self._labels)
+            )
+            labels = self.clusterer.resolve(np.array([word.pop("_label") for word in words], dtype=np.int64))
+            if self.num_speakers:
+                labels = self._merge_to(labels, self.num_speakers)
+        else:
+            labels = np.zeros(len(words), dtype=np.int64)
+        _set_speaker_ids(words, labels)
+        speakers = group_by_speaker(words)
+        self.processing_seconds += time.perf_counter() - start_time
+
+        rtf = self.rtf
+        target_rtf = self.service.target_rtf
+        log = logger.warning if rtf > target_rtf else logger.info
+        log(f"화자 분리 완료 (스트리밍): {len(set(labels.tolist()))}명, "
+            f"{sum(len(chunk) for chunk in self._labels)}개 창, RTF={rtf:.3f} (목표 {target_rtf})")
+        return speakers
+
+    def _merge_to(self, labels: np.ndarray, num_speakers: int) -> np.ndarray:
+        """
+        남은 화자가 num_speakers보다 많으면 가장 가까운 중심끼리 병합 (일괄 처리의 cluster()와 같은 결과 수)
+        """
+        roots = self.clusterer.roots
+        if len(roots) <= num_speakers:
+            return labels
+        groups = _agglomerate(self.clusterer.sums[roots], self.clusterer.threshold, num_speakers)
+        mapping = {root: roots[group] for root, group in zip(roots, groups)}
+        return np.array([mapping[label] for label in labels.tolist()], dtype=np.int64)
+
+    @property
+    def rtf(self) -> float:
+        """실시간 배율 (처리 시간 / 오디오 길이)"""
+        return self.processing_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+class DiarizationService:
+    """
+    음성 구간 검출(VAD) → 화자 임베딩 → 군집화 → 단어 타임스탬프에 화자 배정을 수행하는 서비스 클래스
+    """
+
+    def __init__(self, embedding_model: str = "", threshold: float = 0.0,
+                 window_seconds: float = 1.5, hop_seconds: float = 0.75,
+                 min_region_seconds: float = 0.5, target_rtf: float = 0.1, num_threads: int = 0):
+        """
+        DiarizationService 초기화
+
+        Args:
+            embedding_model: ONNX 화자 임베딩 모델 경로 (비어 있으면 MFCC 임베딩 사용)
+            threshold: 같은 화자로 볼 최소 코사인 유사도 (0이면 임베딩 방식별 기본값)
+            window_seconds: 임베딩을 추출할 창 길이 (초)
+            hop_seconds: 창 이동 간격 (초)
+            min_region_seconds: 임베딩을 추출할 최소 음성 구간 길이 (초)
+            target_rtf: 목표 실시간 배율 (초과 시 경고 로그)
+            num_threads: ONNX 추론 스레드 수 (0이면 기본값)
+        """
+        if embedding_model and os.path.exists(embedding_model):
+            self.embedder = OnnxEmbedder(embedding_model, num_threads)
+        else:
+            if embedding_model:
+                logger.warning(f"화자 임베딩 모델을 찾을 수 없어 MFCC 임베딩을 사용합니다: {embedding_model}")
+            self.embedder = MfccEmbedder()
+
+        self.threshold = threshold or DEFAULT_THRESHOLDS[self.embedder.name]
+        self.window = int(window_seconds * SAMPLE_RATE)
+        self.hop = int(hop_seconds * SAMPLE_RATE)
+        self.min_region = max(int(min_region_seconds * SAMPLE_RATE), FRAME_LENGTH)
+        self.target_rtf = target_rtf
+
+        logger.info(f"DiarizationService 초기화: embedder={self.embedder.name}, threshold={self.threshold}, "
+                    f"window={window_seconds}s, hop={hop_seconds}s")
+
+    def voiced_regions(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Silero VAD(faster-whisper 내장)로 음성 구간 검출
+
+        Returns:
+            (시작 샘플, 끝 샘플) 리스트
+        """
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        options = VadOptions(min_silence_duration_ms=300, speech_pad_ms=100)
+        return [(chunk["start"], chunk["end"]) for chunk in get_speech_timestamps(audio, options)]
+
+    def extract(self, audio: np.ndarray, offset: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        음성 구간을 창으로 나누어 화자 임베딩 추출
+
+        Returns:
+            (창 시작 시각(초), 창 끝 시각(초), (창 개수, d) 임베딩)
+        """
+        windows: List[Tuple[int, int]] = []
+        for start, end in self.voiced_regions(audio):
+            if end - start < self.min_region:
+                continue
+            if end - start <= self.window:
+                windows.append((start, end))
+                continue
+            starts = list(range(start, end - self.window + 1, self.hop))
+            if starts[-1] + self.window < end:
+                starts.append(end - self.window)
+            windows.extend((s, s + self.window) for s in starts)
+
+        if not windows:
+            return np.empty(0), np.empty(0), np.empty((0, 0))
+
+        # 같은 길이의 창끼리 묶어서 한 번에 임베딩
+        bounds = np.array(windows)
+        lengths = bounds[:, 1] - bounds[:, 0]
+        embeddings: List[Optional[np.ndarray]] = [None] * len(windows)
+        for length in np.unique(lengths):
+            indices = np.flatnonzero(lengths == length)
+            for batch in np.array_split(indices, max(1, len(indices) // 64)):
+                stacked = np.stack([audio[bounds[i, 0]:bounds[i, 1]] for i in batch]).astype(np.float32)
+                for i, embedding in zip(batch, self.embedder.embed(stacked)):
+                    embeddings[i] = embedding
+
+        return (
+            bounds[:, 0] / SAMPLE_RATE + offset,
+            bounds[:, 1] / SAMPLE_RATE + offset,
+            np.stack(embeddings),
+        )
+
+    def cluster(self, embeddings: np.ndarray, num_speakers: Optional[int] = None) -> np.ndarray:
+        """
+        일괄(batch) 군집화
+
+        먼저 더 엄격한 임계값의 증분 군집화로 작은 군집을 만들고,
+        그 중심들을 병합 군집화한 뒤 각 창을 가장 가까운 최종 중심에 다시 배정합니다.
+
+        Returns:
+            (창 개수,) 화자 라벨 배열
+        """
+        micro = OnlineSpeakerClusterer(self.threshold + (1.0 - self.threshold) * 0.5, max_speakers=256)
+        micro.assign(embeddings)
+        groups = _agglomerate(micro.sums, self.threshold, num_speakers)
+
+        final_ids = sorted(set(groups))
+        centroids = np.stack([
+            micro.sums[[i for i, group in enumerate(groups) if group == final_id]].sum(axis=0)
+            for final_id in final_ids
+        ])
+        return np.argmax(_normalize(embeddings) @ _normalize(centroids).T, axis=1)
+
+    def diarize(self, audio: Union[np.ndarray, str, BinaryIO], words: List[Dict[str, Any]],
+                num_speakers: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], float]:
+        """
+        전체 오디오의 화자를 분리하고 단어에 speaker_id를 배정 (블로킹 호출)
+
+        Args:
+            audio: 16kHz 모노 배열 (음성 인식에 쓴 배열 재사용 권장), 파일 경로 또는 파일 객체
+            words: Whisper 단어 리스트 (word, start, end 포함) - speaker_id가 추가됨
+            num_speakers: 화자 수 (알고 있는 경우)
+
+        Returns:
+            (words, 화자별 세그먼트 리스트, 실시간 배율)
+        """
+        # 디코딩이 필요하면 그 시간도 화자 분리 비용으로 RTF에 포함
+        start_time = time.perf_counter()
+        if not isinstance(audio, np.ndarray):
+            from faster_whisper import decode_audio
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        starts, ends, embeddings = self.extract(audio)
+        if len(embeddings):
+            labels = self.cluster(embeddings, num_speakers)
+            assign_word_labels(words, starts, ends, labels)
+            word_labels = np.array([word.pop("_label") for word in words], dtype=np.int64)
+        else:
+            word_labels = np.zeros(len(words), dtype=np.int64)
+        _set_speaker_ids(words, word_labels)
+        speakers = group_by_speaker(words)
+
+        duration = len(audio) / SAMPLE_RATE
+        rtf = (time.perf_counter() - start_time) / duration if duration else 0.0
+        log = logger.warning if rtf > self.target_rtf else logger.info
+        log(f"화자 분리 완료: {len(set(word_labels.tolist()))}명, {len(embeddings)}개 창, "
+            f"RTF={rtf:.3f} (목표 {self.target_rtf})")
+
+        return words, speakers, rtf
+
+    def create_stream(self, num_speakers: Optional[int] = None) -> SpeakerStream:
+        """
+        스트리밍 세션용 증분 화자 분리 상태 생성
+        """
+        return SpeakerStream(self, num_speakers)
+
+
+def assign_word_labels(words: List[Dict[str, Any]], starts: np.ndarray, ends: np.ndarray,
+                       labels: np.ndarray) -> None:
+    """
+    각 단어의 중간 시각에 가장 가까운 창의 라벨을 words[i]["_label"]에 기록
+    """
+    if not words:
+        return
+    centers = (starts + ends) / 2
+    order = np.argsort(centers)
+    centers, labels = centers[order], labels[order]
+
+    midpoints = np.array([(word["start"] + word["end"]) / 2 for word in words])
+    right = np.clip(np.searchsorted(centers, midpoints), 0, len(centers) - 1)
+    left = np.clip(right - 1, 0, len(centers) - 1)
+    nearest = np.where(np.abs(centers[left] - midpoints) <= np.abs(centers[right] - midpoints), left, right)
+
+    for word, label in zip(words, labels[nearest]):
+        word["_label"] = int(label)
+
+
+def _set_speaker_ids(words: List[Dict[str, Any]], labels: np.ndarray) -> None:
+    """등장 순서대로 speaker_0, speaker_1, ... 로 번호를 매겨 speaker_id 설정"""
+    numbering: Dict[int, int] = {}
+    for word, label in zip(words, labels.tolist()):
+        numbering.setdefault(label, len(numbering))
+        word["speaker_id"] = f"speaker_{numbering[label]}"
+
+
+def group_by_speaker(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    화자별로 텍스트를 그룹화하는 함수 (ElevenLabs 백엔드의 group_by_speaker와 같은 형식)
+    """
+    speakers = []
+    current_speaker = None
+    current_text = ''
+    current_start = None
+
+    for word in words:
+        speaker_id = word.get('speaker_id', 'Unknown')
+        text = word['word'].strip()
+
+        if current_speaker is None:
+            # 첫 번째 단어
+            current_speaker = speaker_id
+            current_text = text
+            current_start = word['start']
+        elif current_speaker == speaker_id:
+            # 같은 화자가 계속 말하는 중
+            current_text += ' ' + text
+        else:
+            # 화자가 바뀜
+            speakers.append({
+                'speaker': current_speaker,
+                'text': current_text.strip(),
+                'start': current_start,
+                'end': word['start']
+            })
+
+            current_speaker = speaker_id
+            current_text = text
+            current_start = word['start']
+
+    # 마지막 화자 추가
+    if current_text:
+        speakers.append({
+            'speaker': current_speaker,
+            'text': current_text.strip(),
+            'start': current_start,
+            'end': words[-1].get('end', current_start)
+        })
+
+    return speakers
+
+
+# 싱글톤 인스턴스
+_diarization_service_instance: Optional[DiarizationService] = None
+
+
+def get_diarization_service(embedding_model: str = "", threshold: float = 0.0,
+                            window_seconds: float = 1.5, hop_seconds: float = 0.75,
+                            target_rtf: float = 0.1, num_threads: int = 0) -> DiarizationService:
+    """
+    DiarizationService 싱글톤 인스턴스를 반환
+    """
+    global _diarization_service_instance
+
+    if _diarization_service_instance is None:
+        _diarization_service_instance = DiarizationService(
+            embedding_model=embedding_model,
+            threshold=threshold,
+            window_seconds=window_seconds,
+            hop_seconds=hop_seconds,
+            target_rtf=target_rtf,
+            num_threads=num_threads
+        )
+
+    return _diarization_service_instance
@@ -0,0 +1,159 @@
+"""
+세션별 언어 고정(pinning) 서비스
+"""
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 언어 결정 출처
+SOURCE_REQUEST = "request"    # 요청에서 language를 직접 지정
+SOURCE_PINNED = "pinned"      # 세션에 고정된 언어 사용 (언어 감지 생략)
+SOURCE_DETECTED = "detected"  # Faster-Whisper 언어 감지 수행
+
+
+class PinnedLanguage:
+    """세션에 고정된 언어 정보"""
+
+    def __init__(self, language: str, probability: float):
+        self.language = language
+        self.probability = probability
+        self.uses_since_verify = 0
+        self.updated_at = time.time()
+
+
+class LanguageCache:
+    """
+    세션(또는 클라이언트 키)별로 감지된 언어를 기억하여 반복적인 언어 감지를 생략하는 클래스
+
+    감지 확률이 임계값 이상이면 언어를 고정하고, 같은 세션의 이후 요청에는 고정된 언어를 전달합니다.
+    고정된 언어는 reverify_every번 사용할 때마다 한 번씩 다시 감지하여 검증합니다.
+    """
+
+    def __init__(self, threshold: float = 0.8, reverify_every: int = 10,
+                 ttl_seconds: int = 1800, max_sessions: int = 1000):
+        """
+        LanguageCache 초기화
+
+        Args:
+            threshold: 언어를 고정할 최소 감지 확률
+            reverify_every: 고정된 언어를 몇 번 사용한 뒤 다시 감지할지 (0이면 재검증 안 함)
+            ttl_seconds: 마지막 사용 이후 고정을 유지할 시간
+            max_sessions: 기억할 최대 세션 수 (초과 시 가장 오래된 세션부터 제거)
+        """
+        self.threshold = threshold
+        self.reverify_every = reverify_every
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, PinnedLanguage]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[PinnedLanguage]:
+        """
+        세션에 고정된 언어 조회 (만료되었으면 None)
+        """
+        pinned = self._sessions.get(session_id)
+        if pinned is None:
+            return None
+        if time.time() - pinned.updated_at > self.ttl_seconds:
+            del self._sessions[session_id]
+            return None
+        return pinned
+
+    def resolve(self, session_id: Optional[str], language: Optional[str]) -> Tuple[Optional[str], str]:
+        """
+        이번 요청에 사용할 언어 결정
+
+        Args:
+            session_id: 세션 ID (없으면 고정 기능 미사용)
+            language: 요청에서 지정한 언어 (지정 시 항상 우선하며 세션에 고정됨)
+
+        Returns:
+            (모델에 전달할 언어 코드 또는 None, 언어 출처)
+        """
+        if language:
+            return language, SOURCE_REQUEST
+        if not session_id:
+            return None, SOURCE_DETECTED
+
+        pinned = self.get(session_id)
+        if pinned is None:
+            return None, SOURCE_DETECTED
+
+        # 주기적으로 다시 감지하여 고정된 언어가 여전히 맞는지 확인
+        if self.reverify_every and pinned.uses_since_verify >= self.reverify_every:
+            logger.info(f"고정 언어 재검증: session={session_id}, language={pinned.language}")
+            return None, SOURCE_DETECTED
+
+        pinned.uses_since_verify += 1
+        pinned.updated_at = time.time()
+        self._sessions.move_to_end(session_id)
+        return pinned.language, SOURCE_PINNED
+
+    def record(self, session_id: Optional[str], source: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        인식 결과를 세션에 반영하고, 응답에 언어 출처를 추가
+
+        고정된 언어로 인식한 경우 Faster-Whisper는 확률 1.0을 반환하므로
+        고정 당시의 감지 확률로 바꾸어 돌려줍니다.
+        """
+        result["language_source"] = source
+        if not session_id:
+            return result
+
+        if source == SOURCE_PINNED:
+            pinned = self.get(session_id)
+            if pinned is not None:
+                result["language_probability"] = pinned.probability
+        elif source == SOURCE_REQUEST:
+            self.pin(session_id, result["language"], 1.0)
+        elif result["language_probability"] >= self.threshold:
+            self.pin(session_id, result["language"], result["language_probability"])
+        else:
+            pinned = self.get(session_id)
+            if pinned is not None:
+                # 재검증 결과가 불확실하면 기존 고정 언어 유지
+                pinned.uses_since_verify = 0
+                pinned.updated_at = time.time()
+
+        return result
+
+    def pin(self, session_id: str, language: str, probability: float) -> None:
+        """
+        세션에 언어 고정 (이미 있으면 갱신)
+        """
+        previous = self.get(session_id)
+        if previous is None or previous.language != language:
+            logger.info(f"언어 고정: session={session_id}, language={language} (확률: {probability:.2f})")
+
+        self._sessions[session_id] = PinnedLanguage(language, probability)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def clear(self, session_id: str) -> bool:
+        """
+        세션의 고정 언어 해제
+
+        Returns:
+            해제된 언어가 있었는지 여부
+        """
+        return self._sessions.pop(session_id, None) is not None
+
+
+# 싱글톤 인스턴스
+_language_cache_instance: Optional[LanguageCache] = None
+
+
+def get_language_cache(threshold: float = 0.8, reverify_every: int = 10,
+                       ttl_seconds: int = 1800, max_sessions: int = 1000) -> LanguageCache:
+    """
+    LanguageCache 싱글톤 인스턴스를 반환
+    """
+    global _language_cache_instance
+
+    if _language_cache_instance is None:
+        _language_cache_instance = LanguageCache(threshold, reverify_every, ttl_seconds, max_sessions)
+
+    return _language_cache_instance
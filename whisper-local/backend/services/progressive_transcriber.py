@@ -0,0 +1,220 @@
+"""
+업로드 중인 오디오를 앞부분부터 미리 인식하는 조기 처리(early-start) 서비스
+"""
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
+
+from services.whisper_service import WhisperService
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# 새로 만든 디코더/리샘플러의 상태를 채우기 위해 시작 지점 앞에서 함께 디코딩하는 길이 (초)
+PRIME_SECONDS = 0.5
+
+
+def _decode_from(path: str, start_seconds: float) -> Tuple[Any, float]:
+    """
+    스풀 파일을 start_seconds 부근부터 16kHz 모노 float32 배열로 디코딩 (PyAV는 첫 사용 시 import)
+
+    디먹싱(패킷 분리)은 파일 전체를 훑지만, 디코딩과 리샘플링은 start_seconds - PRIME_SECONDS 이후의
+    패킷에만 수행하므로 단계마다 확정되지 않은 구간만 디코딩합니다.
+
+    Returns:
+        (오디오 배열, 배열 첫 샘플의 시각(초)) - 호출자가 start_seconds 위치에 맞춰 잘라 사용
+    """
+    import av  # faster-whisper와 함께 설치됨
+    import numpy as np
+
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    pieces = []
+    first_time = None
+
+    with av.open(path, mode="r", metadata_errors="ignore") as container:
+        stream = container.streams.audio[0]
+        origin = None
+        packet_time = 0.0
+        for packet in container.demux(stream):
+            if packet.pts is not None:
+                if origin is None:
+                    origin = float(packet.pts * stream.time_base)
+                packet_time = float(packet.pts * stream.time_base) - origin
+            packet_end = packet_time + float((packet.duration or 0) * stream.time_base)
+
+            if first_time is None and packet.size and packet_end < start_seconds - PRIME_SECONDS:
+                packet_time = packet_end
+                continue  # 이미 확정된 구간 - 디코딩하지 않음
+
+            try:
+                frames = packet.decode()
+            except av.error.InvalidDataError:
+                continue  # 업로드 중 잘린 패킷 등
+            for frame in frames:
+                if first_time is None:
+                    first_time = packet_time
+                frame.pts = None
+                pieces.extend(resampled.to_ndarray().reshape(-1) for resampled in resampler.resample(frame))
+            packet_time = packet_end
+
+    pieces.extend(resampled.to_ndarray().reshape(-1) for resampled in resampler.resample(None))
+    if not pieces:
+        return np.zeros(0, dtype=np.float32), start_seconds
+    audio = np.concatenate(pieces).astype(np.float32) / 32768.0
+    return audio, first_time if first_time is not None else start_seconds
+
+
+class ProgressiveTranscriber:
+    """
+    스풀 파일의 완성된 앞부분을 업로드 도중에 인식하고 결과를 누적하는 클래스
+
+    매 단계마다 확정 지점 이후에 받은 부분만 디코딩한 뒤, 끝부분(tail)을 제외한 구간을 인식합니다.
+    마지막 세그먼트는 잘렸을 수 있으므로 버리고, 그 앞 세그먼트와 그 단어들까지만 확정(commit)합니다.
+    완료 시에는 확정 지점 이후의 나머지 오디오만 인식하여 결과를 합칩니다.
+    """
+
+    def __init__(self, whisper_service: WhisperService, language: Optional[str] = None,
+                 min_seconds: float = 30.0, tail_seconds: float = 5.0,
+                 min_new_bytes: int = 512 * 1024, beam_size: int = 5,
+                 speaker_stream: Optional[Any] = None):
+        """
+        ProgressiveTranscriber 초기화
+
+        Args:
+            whisper_service: 인식에 사용할 WhisperService
+            language: 언어 코드. None이면 첫 단계에서 감지한 언어를 이후 단계에 고정
+            min_seconds: 한 단계에서 인식할 최소 미확정 오디오 길이 (초)
+            tail_seconds: 아직 불완전할 수 있어 인식하지 않는 끝부분 길이 (초)
+            min_new_bytes: 다시 디코딩을 시도하기 전 필요한 신규 데이터 크기
+            beam_size: 빔 서치 크기
+            speaker_stream: (Optional) 확정 구간마다 증분 화자 분리를 수행할 SpeakerStream
+        """
+        self.whisper_service = whisper_service
+        self.language = language
+        self.language_probability = 1.0 if language else 0.0
+        self.min_seconds = min_seconds
+        self.tail_seconds = tail_seconds
+        self.min_new_bytes = min_new_bytes
+        self.beam_size = beam_size
+        self.speaker_stream = speaker_stream
+        self.committed_seconds = 0.0
+        self.segments: List[Dict[str, Any]] = []
+        self.words: List[Dict[str, Any]] = []
+        self._last_attempt_bytes = 0
+
+    def should_advance(self, received_bytes: int) -> bool:
+        """
+        새 데이터가 충분히 쌓여 다음 단계를 시도할 가치가 있는지 확인
+        """
+        return received_bytes - self._last_attempt_bytes >= self.min_new_bytes
+
+    async def advance(self, path: str, received_bytes: int) -> None:
+        """
+        현재까지 업로드된 앞부분 중 확정 가능한 구간을 인식
+
+        Args:
+            path: 스풀 파일 경로
+            received_bytes: 현재까지 수신한 바이트 수
+        """
+        self._last_attempt_bytes = received_bytes
+
+        try:
+            audio = await self._decode_uncommitted(path)
+        except Exception as e:
+            # 컨테이너가 잘린 위치에 따라 디코딩이 실패할 수 있음 - 다음 청크에서 재시도
+            logger.debug(f"부분 디코딩 실패 (다음 청크에서 재시도): {e}")
+            return
+
+        end = len(audio) - int(self.tail_seconds * SAMPLE_RATE)
+        if end < int(self.min_seconds * SAMPLE_RATE):
+            return
+
+        result = await asyncio.to_thread(
+            self.whisper_service.transcribe_array,
+            audio[:end],
+            self.language,
+            self.beam_size,
+            True,
+            self.committed_seconds
+        )
+        self._pin_language(result)
+
+        # 마지막 세그먼트는 구간 경계에서 잘렸을 수 있으므로 제외 (그 단어들도 다음 단계에서 다시 인식)
+        segments = result["segments"]
+        if len(segments) < 2:
+            return
+
+        commit_end = segments[-2]["end"]
+        committed_words = [word for words in result["segment_words"][:-1] for word in words]
+        if self.speaker_stream is not None:
+            await asyncio.to_thread(
+                self.speaker_stream.process,
+                audio[:int((commit_end - self.committed_seconds) * SAMPLE_RATE)],
+                committed_words,
+                self.committed_seconds
+            )
+
+        self.segments.extend(segments[:-1])
+        self.words.extend(committed_words)
+        self.committed_seconds = commit_end
+
+        logger.info(f"조기 처리 진행: {self.committed_seconds:.1f}초까지 확정 ({len(self.segments)}개 세그먼트)")
+
+    async def finish(self, path: str) -> Dict[str, Any]:
+        """
+        전체 파일 수신 후 남은 구간을 인식하고 최종 결과를 반환
+
+        Returns:
+            WhisperService.transcribe_audio와 같은 형식의 딕셔너리
+        """
+        audio = await self._decode_uncommitted(path)
+
+        if len(audio):
+            result = await asyncio.to_thread(
+                self.whisper_service.transcribe_array,
+                audio,
+                self.language,
+                self.beam_size,
+                True,
+                self.committed_seconds
+            )
+            self._pin_language(result)
+            if self.speaker_stream is not None:
+                await asyncio.to_thread(
+                    self.speaker_stream.process, audio, result["words"], self.committed_seconds
+                )
+            self.segments.extend(result["segments"])
+            self.words.extend(result["words"])
+
+        total_seconds = self.committed_seconds + len(audio) / SAMPLE_RATE
+        logger.info(f"✅ 조기 처리 완료: 전체 {total_seconds:.1f}초 중 "
+                    f"{self.committed_seconds:.1f}초는 업로드 중에 처리됨")
+
+        final = {
+            "text": " ".join([segment["text"] for segment in self.segments]),
+            "language": self.language or "",
+            "language_probability": float(self.language_probability),
+            "segments": self.segments,
+            "words": self.words
+        }
+        if self.speaker_stream is not None:
+            final["speakers"] = self.speaker_stream.finalize(self.words)
+            final["diarization_rtf"] = self.speaker_stream.rtf
+        return final
+
+    async def _decode_uncommitted(self, path: str):
+        """
+        확정 지점(committed_seconds) 이후의 오디오만 디코딩하여 반환
+        """
+        audio, audio_start = await asyncio.to_thread(_decode_from, path, self.committed_seconds)
+        skip = int(round((self.committed_seconds - audio_start) * SAMPLE_RATE))
+        return audio[max(0, skip):]
+
+    def _pin_language(self, result: Dict[str, Any]) -> None:
+        """
+        첫 단계에서 감지한 언어를 이후 단계에 고정 (구간마다 언어가 바뀌지 않도록)
+        """
+        if self.language is None:
+            self.language = result["language"]
+            self.language_probability = result["language_probability"]
+            logger.info(f"감지된 언어 고정: {self.language} (확률: {self.language_probability:.2f})")
@@ -1,12 +1,19 @@
 """
 Faster-Whisper 음성 인식 서비스
 """
-from faster_whisper import WhisperModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import asyncio
 import logging
 import tempfile
+import threading
 import os
 
+from startup_profile import startup_profile
+
+# faster_whisper는 ctranslate2/onnxruntime까지 함께 로드하므로 모델을 처음 사용할 때 import
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,7 +22,8 @@ class WhisperService:
     Faster-Whisper 모델을 관리하고 음성 인식을 수행하는 서비스 클래스
     """
     
-    def __init__(self, model_size: str = "base", device: str = "cpu", compute_type: str = "int8"):
+    def __init__(self, model_size: str = "base", device: str = "cpu", compute_type: str = "int8",
+                 cpu_threads: int = 0, num_workers: int = 1, max_concurrency: int = 1):
         """
         WhisperService 초기화
         
@@ -23,30 +31,60 @@ class WhisperService:
             model_size: 모델 크기 (tiny, base, small, medium, large-v3)
             device: 실행 디바이스 (cpu, cuda)
             compute_type: 연산 타입 (int8, int8_float16, float16, float32)
+            cpu_threads: 추론 1건당 CPU 스레드 수 (0이면 라이브러리 기본값)
+            num_workers: 동시에 추론할 수 있는 모델 워커 수
+            max_concurrency: 동시에 실행할 인식 요청 수 (초과분은 대기)
         """
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
-        self._model: Optional[WhisperModel] = None
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.max_concurrency = max(1, max_concurrency)
+        self._model: Optional["WhisperModel"] = None
+        self._model_lock = threading.Lock()
+        # 동시 추론 수 제한 (코어 과다 할당 방지)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
         
-        logger.info(f"WhisperService 초기화: model={model_size}, device={device}, compute_type={compute_type}")
+        logger.info(f"WhisperService 초기화: model={model_size}, device={device}, compute_type={compute_type}, "
+                    f"cpu_threads={cpu_threads}, num_workers={num_workers}, max_concurrency={self.max_concurrency}")
+    
+    @property
+    def is_loaded(self) -> bool:
+        """모델이 이미 로드되었는지 여부"""
+        return self._model is not None
     
     @property
-    def model(self) -> WhisperModel:
+    def model(self) -> "WhisperModel":
         """
         모델 인스턴스를 반환 (Lazy Loading)
         처음 호출 시에만 모델을 로드하고, 이후에는 캐시된 인스턴스를 재사용합니다.
         """
         if self._model is None:
-            logger.info(f"Whisper 모델 로딩 중... (최초 실행 시 모델 다운로드로 시간이 걸릴 수 있습니다)")
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type
-            )
-            logger.info("✅ Whisper 모델 로딩 완료")
+            # 업로드 조기 처리 스레드와 요청이 동시에 로드하지 않도록 잠금
+            with self._model_lock:
+                if self._model is None:
+                    with startup_profile.phase("whisper_import", lazy=True):
+                        from faster_whisper import WhisperModel
+                    
+                    logger.info(f"Whisper 모델 로딩 중... (최초 실행 시 모델 다운로드로 시간이 걸릴 수 있습니다)")
+                    with startup_profile.phase("model_load", lazy=True):
+                        self._model = WhisperModel(
+                            self.model_size,
+                            device=self.device,
+                            compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads,
+                            num_workers=self.num_workers
+                        )
+                    logger.info("✅ Whisper 모델 로딩 완료")
         return self._model
     
+    def warm_up(self) -> None:
+        """
+        faster_whisper import와 모델 로딩을 미리 수행 (블로킹 호출)
+        """
+        _ = self.model
+    
     async def transcribe_audio(
         self,
         audio_content: bytes,
@@ -81,47 +119,24 @@ class WhisperService:
             temp_path = temp_file.name
         
         try:
-            # Whisper 모델로 음성 인식 수행
-            segments_generator, info = self.model.transcribe(
+            # Whisper 모델로 음성 인식 수행 (이벤트 루프를 막지 않도록 스레드에서 실행)
+            segments_list, info = await asyncio.to_thread(
+                self._run_transcribe,
                 temp_path,
                 language=language,
                 beam_size=beam_size,
                 word_timestamps=word_timestamps,
-                vad_filter=False,  # VAD 필터 비활성화 (조용한 음성도 처리)
             )
             
             logger.info(f"감지된 언어: {info.language} (확률: {info.language_probability:.2f})")
-            
-            # Generator를 리스트로 변환하여 실제 처리 수행
-            segments_list = list(segments_generator)
             logger.info(f"세그먼트 수: {len(segments_list)}")
             
             # 전체 텍스트 생성
             full_text = " ".join([segment.text.strip() for segment in segments_list])
             logger.info(f"전체 텍스트 길이: {len(full_text)}, 내용: '{full_text[:100]}'...")
             
-            # 세그먼트 데이터 포맷팅
-            formatted_segments = []
-            all_words = []
-            
-            for segment in segments_list:
-                segment_data = {
-                    "start": segment.start,
-                    "end": segment.end,
-                    "text": segment.text.strip()
-                }
-                formatted_segments.append(segment_data)
-                
-                # 단어별 타임스탬프가 있는 경우
-                if word_timestamps and segment.words:
-                    for word in segment.words:
-                        word_data = {
-                            "word": word.word,
-                            "start": word.start,
-                            "end": word.end,
-                            "probability": word.probability
-                        }
-                        all_words.append(word_data)
+            formatted_segments, segment_words = self.format_segments(segments_list, word_timestamps)
+            all_words = [word for words in segment_words for word in words]
             
             logger.info(f"✅ 음성 인식 완료: {len(formatted_segments)}개 세그먼트, {len(all_words)}개 단어")
             
@@ -130,7 +145,7 @@ class WhisperService:
                 "language": info.language,
                 "language_probability": float(info.language_probability),
                 "segments": formatted_segments,
-                "words": all_words if word_timestamps else []
+                "words": all_words
             }
             
             return result
@@ -141,19 +156,120 @@ class WhisperService:
             # if os.path.exists(temp_path):
             #     os.unlink(temp_path)
             #     logger.debug(f"임시 파일 삭제: {temp_path}")
+    
+    def transcribe_array(
+        self,
+        audio: Any,
+        language: Optional[str] = None,
+        beam_size: int = 5,
+        word_timestamps: bool = True,
+        offset: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        디코딩된 16kHz 모노 오디오 배열을 텍스트로 변환 (블로킹 호출)
+        
+        업로드 중인 파일의 앞부분을 미리 처리할 때 사용하며,
+        이벤트 루프를 막지 않도록 스레드에서 호출해야 합니다.
+        
+        Args:
+            audio: float32 numpy 배열 (16kHz 모노)
+            language: 언어 코드. None이면 자동 감지
+            beam_size: 빔 서치 크기
+            word_timestamps: 단어별 타임스탬프 포함 여부
+            offset: 결과 타임스탬프에 더할 시작 위치 (초)
+        
+        Returns:
+            transcribe_audio와 같은 형식의 딕셔너리
+            (+ segment_words: 세그먼트별 단어 리스트, segments와 같은 순서)
+        """
+        segments_list, info = self._run_transcribe(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+        )
+        formatted_segments, segment_words = self.format_segments(segments_list, word_timestamps, offset)
+        
+        return {
+            "text": " ".join([segment["text"] for segment in formatted_segments]),
+            "language": info.language,
+            "language_probability": float(info.language_probability),
+            "segments": formatted_segments,
+            "words": [word for words in segment_words for word in words],
+            "segment_words": segment_words
+        }
+    
+    def _run_transcribe(self, audio: Any, **kwargs) -> Tuple[List[Any], Any]:
+        """
+        동시 실행 슬롯을 확보한 뒤 모델 추론을 끝까지 수행 (블로킹 호출)
+        
+        Returns:
+            (세그먼트 리스트, TranscriptionInfo)
+        """
+        with self._slots:
+            segments_generator, info = self.model.transcribe(
+                audio,
+                vad_filter=False,  # VAD 필터 비활성화 (조용한 음성도 처리)
+                **kwargs
+            )
+            # Generator를 리스트로 변환하여 실제 처리 수행
+            return list(segments_generator), info
+    
+    @staticmethod
+    def format_segments(segments_list: List[Any], word_timestamps: bool = True,
+                        offset: float = 0.0) -> Tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
+        """
+        Faster-Whisper 세그먼트를 응답 형식의 세그먼트/단어 리스트로 변환
+        
+        Args:
+            segments_list: Faster-Whisper Segment 리스트
+            word_timestamps: 단어별 타임스탬프 포함 여부
+            offset: 타임스탬프에 더할 시작 위치 (초)
+        
+        Returns:
+            (세그먼트 리스트, 세그먼트별 단어 리스트) - 두 리스트의 순서와 길이는 같음
+        """
+        formatted_segments = []
+        segment_words = []
+        
+        for segment in segments_list:
+            segment_data = {
+                "start": segment.start + offset,
+                "end": segment.end + offset,
+                "text": segment.text.strip()
+            }
+            formatted_segments.append(segment_data)
+            
+            # 단어별 타임스탬프가 있는 경우
+            words = []
+            if word_timestamps and segment.words:
+                for word in segment.words:
+                    word_data = {
+                        "word": word.word,
+                        "start": word.start + offset,
+                        "end": word.end + offset,
+                        "probability": word.probability
+                    }
+                    words.append(word_data)
+            segment_words.append(words)
+        
+        return formatted_segments, segment_words
 
 
 # 싱글톤 인스턴스 (앱 시작 시 한 번만 생성)
 _whisper_service_instance: Optional[WhisperService] = None
 
 
-def get_whisper_service(model_size: str = "base", device: str = "cpu", compute_type: str = "int8") -> WhisperService:
+def get_whisper_service(model_size: str = "base", device: str = "cpu", compute_type: str = "int8",
+                        cpu_threads: int = 0, num_workers: int = 1, max_concurrency: int = 1) -> WhisperService:
     """
     WhisperService 싱글톤 인스턴스를 반환
     """
     global _whisper_service_instance
     
     if _whisper_service_instance is None:
-        _whisper_service_instance = WhisperService(model_size, device, compute_type)
+        _whisper_service_instance = WhisperService(
+            model_size, device, compute_type, cpu_threads, num_workers, max_concurrency
+        )
     
     return _whisper_service_instance
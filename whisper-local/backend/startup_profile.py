@@ -0,0 +1,74 @@
+"""
+콜드 스타트 단계별 시간 측정 (import, config, app 생성, 모델 로딩)
+"""
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# 시작 시점에 로드되면 안 되는 무거운 의존성 (첫 사용 또는 warm-up 시 로드)
+HEAVY_MODULES = ["faster_whisper", "ctranslate2", "onnxruntime", "av"]
+
+
+class StartupProfile:
+    """
+    서버 시작 과정의 각 단계 소요 시간을 기록하는 클래스
+
+    부팅 단계(boot)와 첫 사용 시 실행되는 지연 단계(lazy)를 따로 기록하므로,
+    부팅 합계는 첫 요청 이후에도 바뀌지 않습니다.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.lazy_phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str, lazy: bool = False) -> Iterator[None]:
+        """
+        with 블록의 소요 시간을 name 단계로 기록 (같은 이름은 누적)
+
+        Args:
+            name: 단계 이름
+            lazy: True이면 부팅 이후 첫 사용 시 실행되는 단계로 기록
+        """
+        phases = self.lazy_phases if lazy else self.phases
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            phases[name] = phases.get(name, 0.0) + elapsed
+            logger.info(f"⏱️ {'지연' if lazy else '시작'} 단계 '{name}': {elapsed * 1000:.1f}ms")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        단계별 소요 시간(ms)과 현재 로드된 무거운 모듈 목록 반환
+        """
+        return {
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "boot_total_ms": round(sum(self.phases.values()) * 1000, 1),
+            "lazy_phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.lazy_phases.items()},
+            "heavy_modules_loaded": {name: name in sys.modules for name in HEAVY_MODULES},
+        }
+
+    def format_report(self) -> str:
+        """
+        CLI 출력용 텍스트 리포트
+        """
+        report = self.report()
+        lines = ["=== Startup Profile ==="]
+        for name, ms in report["phases_ms"].items():
+            lines.append(f"  {name:<12} {ms:>10.1f} ms")
+        lines.append(f"  {'boot total':<12} {report['boot_total_ms']:>10.1f} ms")
+        for name, ms in report["lazy_phases_ms"].items():
+            lines.append(f"  {name:<12} {ms:>10.1f} ms (lazy)")
+        loaded = [name for name, is_loaded in report["heavy_modules_loaded"].items() if is_loaded]
+        lines.append(f"  heavy modules loaded: {', '.join(loaded) or '(none)'}")
+        return "\n".join(lines)
+
+
+# 싱글톤 인스턴스
+startup_profile = StartupProfile()
@@ -3,6 +3,7 @@ import { Mic, Square, Download, FileText, Loader2, Globe, MessageCircle, Home, S
 import { motion } from 'framer-motion';
 import toast, { Toaster } from 'react-hot-toast';
 import { config } from '../config';
+import { uploadResumable } from '../resumableUpload';
 
 const { API_ENDPOINTS } = config;
 
@@ -27,6 +28,7 @@ const LocalRecorder = () => {
     const mediaRecorderRef = useRef(null);
     const audioChunksRef = useRef([]);
     const audioUrlRef = useRef(null);
+    const sessionIdRef = useRef(null); // 녹음 세션 ID (서버가 감지 언어를 고정하는 키)
 
     // 녹음 시작
     const startRecording = async () => {
@@ -52,6 +54,8 @@ const LocalRecorder = () => {
             setHasAudio(false);
             setDetectedLanguage('');
             audioChunksRef.current = [];
+            // 새 녹음마다 세션 ID 발급 - 같은 녹음의 실시간/최종 요청은 언어 감지를 한 번만 수행
+            sessionIdRef.current = crypto.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`;
 
             // 이전 오디오 URL 정리
             if (audioUrlRef.current) {
@@ -157,7 +161,8 @@ const LocalRecorder = () => {
             const audioBlob = new Blob(currentChunks, { type: 'audio/webm' });
             const formData = new FormData();
             formData.append('audio', audioBlob, 'realtime.webm');
-            // 언어 자동 감지
+            // 언어 자동 감지 (세션에 고정된 언어가 있으면 서버가 감지를 생략)
+            formData.append('session_id', sessionIdRef.current);
 
             const response = await fetch(API_ENDPOINTS.TRANSCRIBE, {
                 method: 'POST',
@@ -192,26 +197,11 @@ const LocalRecorder = () => {
             const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
             console.log(`오디오 Blob 크기: ${audioBlob.size} bytes`);
 
-            // FormData 생성
-            const formData = new FormData();
-            formData.append('audio', audioBlob, 'recording.webm');
-            // 언어를 자동 감지하도록 설정 (번역하지 않음)
-            // formData.append('language', language.toLowerCase());
-
-            // 백엔드로 전송
+            // 백엔드로 청크 업로드 (끊기면 이어서 전송, 언어는 자동 감지)
             console.log('백엔드로 음성 인식 요청 중...');
-            const response = await fetch(API_ENDPOINTS.TRANSCRIBE, {
-                method: 'POST',
-                body: formData,
+            const data = await uploadResumable(audioBlob, 'recording.webm', {
+                sessionId: sessionIdRef.current,
             });
-
-            if (!response.ok) {
-                const errorText = await response.text();
-                console.error('API 오류:', errorText);
-                throw new Error('음성 인식 처리 중 오류가 발생했습니다');
-            }
-
-            const data = await response.json();
             console.log('음성 인식 결과:', data);
 
             if (data.success) {
@@ -247,22 +237,9 @@ const LocalRecorder = () => {
         setTranscript('');
 
         try {
-            const formData = new FormData();
-            formData.append('audio', file);
-            // 언어를 자동 감지하도록 설정 (번역하지 않음)
-            // formData.append('language', language.toLowerCase());
-
+            // 청크 업로드 (끊기면 이어서 전송, 언어는 자동 감지)
             console.log('파일 업로드 중:', file.name);
-            const response = await fetch(API_ENDPOINTS.TRANSCRIBE, {
-                method: 'POST',
-                body: formData,
-            });
-
-            if (!response.ok) {
-                throw new Error('음성 인식 처리 중 오류가 발생했습니다');
-            }
-
-            const data = await response.json();
+            const data = await uploadResumable(file, file.name);
             console.log('음성 인식 결과:', data);
 
             if (data.success) {
@@ -8,6 +8,10 @@ export const config = {
     API_ENDPOINTS: {
         TRANSCRIBE: `${API_BASE_URL}/api/transcribe`,
         HEALTH: `${API_BASE_URL}/api/health`,
+        UPLOADS: `${API_BASE_URL}/api/uploads`,
     },
     API_BASE_URL,
+    // 재개 가능한 청크 업로드 설정
+    UPLOAD_CHUNK_SIZE: 1024 * 1024,
+    UPLOAD_MAX_RETRIES: 5,
 };